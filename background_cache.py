@@ -0,0 +1,54 @@
+"""Pre-rendered background surfaces.
+
+BackgroundCache renders each (size, theme) gradient once, converted to the
+display format, for a single blit per frame.
+"""
+
+import pygame
+
+from engine import to_display_format
+
+# Gradient themes: (top color, bottom color)
+THEMES = {
+    "sky": ((135, 206, 235), (255, 255, 255)),
+}
+DEFAULT_THEME = "sky"
+
+
+def render_gradient(size, top_color, bottom_color):
+    width, height = size
+    # Build a single column with exactly the colors the old per-row loop used,
+    # then stretch it horizontally (no interpolation happens along x)
+    column = pygame.Surface((1, height))
+    for y in range(height):
+        color_ratio = y / height
+        r = int(top_color[0] + (bottom_color[0] - top_color[0]) * color_ratio)
+        g = int(top_color[1] + (bottom_color[1] - top_color[1]) * color_ratio)
+        b = int(top_color[2] + (bottom_color[2] - top_color[2]) * color_ratio)
+        column.set_at((0, y), (r, g, b))
+    return pygame.transform.scale(column, (width, height))
+
+
+class BackgroundCache:
+    def __init__(self, themes=None):
+        self.themes = themes if themes is not None else THEMES
+        self.surfaces = {}
+
+    def get(self, size, theme=DEFAULT_THEME):
+        key = (tuple(size), theme)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            top_color, bottom_color = self.themes[theme]
+            surface = render_gradient(size, top_color, bottom_color)
+            surface = to_display_format(surface)
+            self.surfaces[key] = surface
+        return surface
+
+    def draw(self, screen, theme=DEFAULT_THEME):
+        screen.blit(self.get(screen.get_size(), theme), (0, 0))
+
+    def invalidate(self, size=None, theme=None):
+        """Drop cached surfaces matching size and/or theme (all if neither given)."""
+        for key in list(self.surfaces):
+            if (size is None or key[0] == tuple(size)) and (theme is None or key[1] == theme):
+                del self.surfaces[key]
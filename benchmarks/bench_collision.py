@@ -0,0 +1,95 @@
+"""Micro-benchmark for platform collision.
+
+Times one frame's platform collision query for levels of 5, 20, 200 and 2000
+platforms using the old per-platform loop, the grid alone, one collidelistall
+over every platform, and collision.PlatformColliders (what the game uses):
+
+    python benchmarks/bench_collision.py
+"""
+
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from collision import PlatformColliders
+from spatial_index import UniformGrid
+
+PLATFORM_COUNTS = [5, 20, 200, 2000]
+# Platforms per screen-sized area, roughly what the shipped levels use
+PLATFORMS_PER_SCREEN = 20
+SCREEN_WIDTH = 1000
+SCREEN_HEIGHT = 600
+PLAYER_SIZE = (40, 60)
+QUERIES = 2000
+
+
+def make_level(count, rng):
+    """Random platforms, with the world widened to keep density constant."""
+    width = SCREEN_WIDTH * max(1, count // PLATFORMS_PER_SCREEN)
+    platforms = [pygame.Rect(rng.randrange(0, width - 150), rng.randrange(100, SCREEN_HEIGHT - 50),
+                             rng.randrange(60, 200), 20) for _ in range(count)]
+    players = [pygame.Rect(rng.randrange(0, width - PLAYER_SIZE[0]), rng.randrange(0, SCREEN_HEIGHT - PLAYER_SIZE[1]),
+                           *PLAYER_SIZE) for _ in range(QUERIES)]
+    return platforms, players
+
+
+def python_loop(platforms, players):
+    # The collision loop Player.update used originally
+    hits = 0
+    for player in players:
+        for platform in platforms:
+            if player.colliderect(pygame.Rect(platform)):
+                hits += 1
+    return hits
+
+
+def grid_only(grid, players):
+    hits = 0
+    for player in players:
+        for platform in grid.query(player):
+            if player.colliderect(platform):
+                hits += 1
+    return hits
+
+
+def batch(platforms, players):
+    hits = 0
+    for player in players:
+        hits += len(player.collidelistall(platforms))
+    return hits
+
+
+def colliders(platform_colliders, players):
+    hits = 0
+    for player in players:
+        hits += len(platform_colliders.hits(player))
+    return hits
+
+
+def time_per_query(func, *args, repeat=5):
+    best = min(timeit.repeat(lambda: func(*args), number=1, repeat=repeat))
+    return best / QUERIES * 1e6
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'platforms':>9}  {'loop us':>9}  {'grid us':>9}  {'batch us':>9}  {'colliders us':>12}")
+    for count in PLATFORM_COUNTS:
+        platforms, players = make_level(count, rng)
+        grid = UniformGrid.from_rects(platforms)
+        platform_colliders = PlatformColliders(platforms)
+        expected = batch(platforms, players)
+        assert python_loop(platforms, players) == grid_only(grid, players) == colliders(platform_colliders, players) == expected
+        print(f"{count:>9}  {time_per_query(python_loop, platforms, players):>9.2f}  "
+              f"{time_per_query(grid_only, grid, players):>9.2f}  "
+              f"{time_per_query(batch, platforms, players):>9.2f}  "
+              f"{time_per_query(colliders, platform_colliders, players):>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
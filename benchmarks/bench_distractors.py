@@ -0,0 +1,56 @@
+"""Micro-benchmark for wrong-answer generation.
+
+Times the old retry loop against distractors.make_distractors for a typical
+answer, for answers near zero (where the loop rejects most draws) and with
+every mistake strategy enabled:
+
+    python benchmarks/bench_distractors.py
+"""
+
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from distractors import STRATEGIES, make_distractors
+
+CASES = [
+    # (label, num1, num2, symbol, correct, spread)
+    ("typical 37 + 18", 37, 18, "+", 55, 10),
+    ("small 1 - 1", 1, 1, "-", 0, 10),
+    ("small 2 × 2", 2, 2, "×", 4, 15),
+    ("tight 1 - 1, ±3", 1, 1, "-", 0, 3),
+]
+CALLS = 20000
+
+
+def retry_loop(correct, spread):
+    # The loop MathQuestion.generate_question used originally
+    answers = [correct]
+    while len(answers) < 4:
+        wrong = correct + random.randint(-spread, spread)
+        if wrong not in answers and wrong >= 0:
+            answers.append(wrong)
+    return answers[1:]
+
+
+def time_per_call(func):
+    best = min(timeit.repeat(func, number=CALLS, repeat=5))
+    return best / CALLS * 1e6
+
+
+def main():
+    random.seed(0)
+    strategies = list(STRATEGIES)
+    print(f"{'case':<18}  {'retry loop us':>13}  {'sampled us':>10}  {'strategies us':>13}")
+    for label, num1, num2, symbol, correct, spread in CASES:
+        loop = time_per_call(lambda: retry_loop(correct, spread))
+        sampled = time_per_call(lambda: make_distractors(num1, num2, symbol, correct, spread))
+        with_strategies = time_per_call(lambda: make_distractors(num1, num2, symbol, correct, spread, strategies))
+        print(f"{label:<18}  {loop:>13.2f}  {sampled:>10.2f}  {with_strategies:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
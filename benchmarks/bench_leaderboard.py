@@ -0,0 +1,81 @@
+"""Leaderboard query benchmark.
+
+Fills a temporary SQLite leaderboard with random results from a few thousand
+students and times the common queries:
+
+    python benchmarks/bench_leaderboard.py --rows 1000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leaderboard_sqlite import DATE_FORMAT, SQLiteStore, start_of_week
+
+STUDENTS = 5000
+# Results spread over this many days back from now
+HISTORY_DAYS = 365
+BATCH = 50000
+
+
+def random_entries(count, rng, now):
+    names = [f"student{i}" for i in range(STUDENTS)]
+    for _ in range(count):
+        yield {
+            'name': rng.choice(names),
+            'score': rng.randrange(0, 80) * 10,
+            'level': rng.randint(1, 5),
+            'date': (now - timedelta(minutes=rng.randrange(HISTORY_DAYS * 24 * 60))).strftime(DATE_FORMAT),
+        }
+
+
+def time_query(func, *args, repeat=200):
+    func(*args)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(*args)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time leaderboard queries")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    now = datetime.now()
+    with tempfile.TemporaryDirectory() as directory:
+        store = SQLiteStore(os.path.join(directory, "leaderboard.db"))
+        start = time.perf_counter()
+        entries = random_entries(args.rows, rng, now)
+        for offset in range(0, args.rows, BATCH):
+            store.add_many(next(entries) for _ in range(min(BATCH, args.rows - offset)))
+        store.db.execute("ANALYZE")
+        print(f"inserted {len(store):,} rows in {time.perf_counter() - start:.1f}s")
+
+        top_player = store.best_per_player(1)[0]['name']
+        last_player = store.db.execute("SELECT name FROM best_scores ORDER BY score, level LIMIT 1").fetchone()[0]
+        queries = [
+            ("top 10", store.top, 10),
+            ("top 10 on level 3", store.top, 10, 3),
+            ("top 10 this week", store.top_since, start_of_week(now), 10),
+            ("best per student", store.best_per_player, 10),
+            ("one student's results", store.player_scores, top_player, 10),
+            ("rank of top student", store.rank_of, top_player),
+            ("rank of last student", store.rank_of, last_player),
+        ]
+        new_entry = {'name': "new student", 'score': 0, 'level': 1, 'date': now.strftime(DATE_FORMAT)}
+        queries.append(("add one result", store.add, new_entry))
+        for label, func, *func_args in queries:
+            print(f"{label:<24} {time_query(func, *func_args):8.3f} ms")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Startup benchmark.
+
+Times a cold start in fresh interpreters (SDL dummy drivers): importing
+math_quiz_adventure_enhanced, constructing Game (pygame startup, sprites,
+leaderboard, first level) and drawing the first frame. Reports the median of
+--runs starts:
+
+    python benchmarks/bench_startup.py --runs 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run in the child interpreter; prints its timings as JSON
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+import math_quiz_adventure_enhanced as mqa
+imported = time.perf_counter()
+game = mqa.Game()
+constructed = time.perf_counter()
+game.render()
+rendered = time.perf_counter()
+game.leaderboard.close()
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'game_ms': (constructed - imported) * 1000,
+    'first_frame_ms': (rendered - constructed) * 1000,
+    'total_ms': (rendered - start) * 1000,
+}))
+"""
+
+
+def measure_startup(runs):
+    """Median of each timing over runs fresh interpreters."""
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", MATH_QUIZ_TELEMETRY="",
+               PYGAME_HIDE_SUPPORT_PROMPT="1")
+    samples = []
+    with tempfile.TemporaryDirectory() as directory:
+        for _ in range(runs):
+            output = subprocess.run([sys.executable, "-c", CHILD, ROOT], cwd=directory, env=env,
+                                    capture_output=True, text=True, check=True).stdout
+            samples.append(json.loads(output.splitlines()[-1]))
+    return {name: statistics.median(sample[name] for sample in samples) for name in samples[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time a cold start of the game")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    for name, value in measure_startup(args.runs).items():
+        print(f"{name:<16} {value:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
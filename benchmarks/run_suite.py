@@ -0,0 +1,309 @@
+"""Benchmark suite.
+
+Runs headless (SDL dummy drivers) and measures, for comparing commits:
+
+    layouts      full-repaint and dirty-rect frames/sec, and the cost of one
+                 simulation step, for every level layout
+    screens      full-repaint frames/sec of each overlay screen
+    questions    questions/sec from MathQuestion and question_batch, and the
+                 cost of filling a level's question pool
+    leaderboard  open, add (written to disk) and top-10 times for the JSON-lines
+                 and SQLite stores holding 10, 10k and 1M results
+    startup      import, Game() and first-frame times of a cold start
+
+Results are printed and written as JSON; pass an earlier result file to
+--compare to see what changed:
+
+    python benchmarks/run_suite.py --output before.json
+    git checkout my-branch
+    python benchmarks/run_suite.py --output after.json --compare before.json
+
+Timings are the best of --repeat runs (startup: the median of 5 cold starts).
+Use --only to run some sections and --sizes to change the leaderboard sizes
+(1M takes a minute or two).
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Sets the SDL dummy drivers and turns telemetry off before the game imports pygame
+import headless
+
+import pygame
+
+import math_quiz_adventure_enhanced as mqa
+from bench_leaderboard import random_entries
+from bench_startup import measure_startup
+from leaderboard_sqlite import DATE_FORMAT, SQLiteStore
+from leaderboard_store import JsonLinesStore
+from levels import MAX_LEVEL
+from question_batch import generate_batch
+from question_pool import QuestionPool
+
+SECTIONS = ["layouts", "screens", "questions", "leaderboard", "startup"]
+FRAMES = 300
+STEPS = 3000
+QUESTIONS = 20000
+BATCH_QUESTIONS = 100_000
+LEADERBOARD_SIZES = [10, 10_000, 1_000_000]
+LEADERBOARD_ADDS = 20
+LEADERBOARD_TOPS = 200
+STARTUP_RUNS = 5
+# Results written per chunk when filling a leaderboard
+FILL_CHUNK = 50_000
+
+
+def best_time(func, repeat):
+    """Fastest of repeat runs of func(), in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def start_playing(game, level):
+    game.reset_game()
+    game.player_name = "Bench"
+    game.show_name_input_start = False
+    game.game_started = True
+    game.current_level = level
+    game.setup_level_layout()
+
+
+def bench_layouts(game, repeat):
+    results = {}
+    for level in range(1, MAX_LEVEL + 1):
+        start_playing(game, level)
+
+        def full_repaints():
+            for _ in range(FRAMES):
+                game.renderer.invalidate()
+                game.render()
+
+        def dirty_frames():
+            # Player sweeping along the ground - the everyday gameplay frame
+            for frame in range(FRAMES):
+                game.player.x = 5 * (frame % 180)
+                game.render()
+
+        def steps():
+            for _ in range(STEPS):
+                game.step(headless.NO_KEYS)
+
+        game.player.x = 50
+        game.player.y = mqa.SCREEN_HEIGHT - 100
+        step_seconds = best_time(steps, repeat)
+        results[f"level_{level}"] = {
+            'full_fps': FRAMES / best_time(full_repaints, repeat),
+            'dirty_fps': FRAMES / best_time(dirty_frames, repeat),
+            'step_us': step_seconds / STEPS * 1e6,
+        }
+    return results
+
+
+def bench_screens(game, repeat):
+    def start_screen():
+        game.reset_game()
+
+    def level_transition():
+        start_playing(game, 2)
+        game.show_level_transition = True
+        game.transition_timer = mqa.LEVEL_TRANSITION_STEPS
+
+    def question():
+        start_playing(game, 3)
+        game.current_door = game.doors[0]
+        game.current_question = mqa.MathQuestion(3, 1)
+        game.show_question = True
+
+    def question_answered():
+        question()
+        game.question_result = "correct"
+
+    def level_complete():
+        start_playing(game, 1)
+        game.level_completed = True
+
+    def name_input():
+        start_playing(game, MAX_LEVEL)
+        game.game_won = True
+        game.show_name_input = True
+
+    def leaderboard():
+        start_playing(game, 1)
+        game.show_leaderboard = True
+
+    screens = [
+        ("start", start_screen),
+        ("level_transition", level_transition),
+        ("question", question),
+        ("question_answered", question_answered),
+        ("level_complete", level_complete),
+        ("name_input", name_input),
+        ("leaderboard", leaderboard),
+    ]
+    results = {}
+    for name, setup in screens:
+        setup()
+        game.render()
+
+        def frames():
+            for _ in range(FRAMES):
+                game.renderer.invalidate()
+                game.render()
+
+        results[name] = {'fps': FRAMES / best_time(frames, repeat)}
+    return results
+
+
+def bench_questions(repeat):
+    results = {}
+    for level in range(1, MAX_LEVEL + 1):
+        numbers = list(range(1, 6))
+        per_question = best_time(lambda: [mqa.MathQuestion(level, 1) for _ in range(QUESTIONS)], repeat)
+        pool = best_time(lambda: QuestionPool(lambda number: mqa.MathQuestion(level, number), numbers), repeat)
+        batch = best_time(lambda: generate_batch(level, BATCH_QUESTIONS, seed=level), repeat)
+        results[f"level_{level}"] = {
+            'questions_per_sec': QUESTIONS / per_question,
+            'pool_fill_ms': pool * 1000,
+            'batch_questions_per_sec': BATCH_QUESTIONS / batch,
+        }
+    return results
+
+
+def fill_leaderboard(directory, size, rng):
+    """A JSON-lines log and an SQLite database holding the same size results."""
+    log_path = os.path.join(directory, "leaderboard.jsonl")
+    db_path = os.path.join(directory, "leaderboard.db")
+    store = SQLiteStore(db_path)
+    entries = random_entries(size, rng, datetime.now())
+    with open(log_path, 'w', encoding='utf-8') as log:
+        for offset in range(0, size, FILL_CHUNK):
+            chunk = [next(entries) for _ in range(min(FILL_CHUNK, size - offset))]
+            log.write("".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in chunk))
+            store.add_many(chunk)
+    store.close()
+    return log_path, db_path
+
+
+def time_store(open_store, repeat):
+    start = time.perf_counter()
+    store = open_store()
+    open_ms = (time.perf_counter() - start) * 1000
+    entry = {'name': "Bench", 'score': 0, 'level': 1, 'date': datetime.now().strftime(DATE_FORMAT)}
+    add = best_time(lambda: [store.add(entry) for _ in range(LEADERBOARD_ADDS)], repeat)
+    top = best_time(lambda: [store.top(10) for _ in range(LEADERBOARD_TOPS)], repeat)
+    store.close()
+    return {
+        'open_ms': open_ms,
+        'add_ms': add / LEADERBOARD_ADDS * 1000,
+        'top10_ms': top / LEADERBOARD_TOPS * 1000,
+    }
+
+
+def bench_leaderboard(sizes, repeat):
+    results = {}
+    rng = random.Random(0)
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            log_path, db_path = fill_leaderboard(directory, size, rng)
+            # Replays the whole log: no snapshot yet
+            results[f"jsonl_{size}"] = time_store(lambda: JsonLinesStore(log_path, compact_every=10 ** 9), repeat)
+            results[f"sqlite_{size}"] = time_store(lambda: SQLiteStore(db_path), repeat)
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'platform': platform.platform(),
+    }
+
+
+def flatten(results, prefix=""):
+    for key, value in results.items():
+        if isinstance(value, dict):
+            yield from flatten(value, f"{prefix}{key}.")
+        else:
+            yield f"{prefix}{key}", value
+
+
+def report(results, baseline=None):
+    previous = dict(flatten(baseline)) if baseline is not None else {}
+    for name, value in flatten(results):
+        line = f"{name:<48} {value:14.3f}"
+        old = previous.get(name)
+        if old:
+            line += f"  was {old:14.3f}  ({(value - old) / old:+.1%})"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark suite")
+    parser.add_argument("--only", default=",".join(SECTIONS), help="comma-separated sections to run")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in LEADERBOARD_SIZES),
+                        help="leaderboard sizes")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="earlier results JSON to compare with")
+    args = parser.parse_args()
+
+    sections = args.only.split(",")
+    unknown = set(sections) - set(SECTIONS)
+    if unknown:
+        parser.error(f"unknown sections: {', '.join(sorted(unknown))}")
+    random.seed(0)
+
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        # The game's leaderboard files go in the temporary directory
+        os.chdir(directory)
+        game = mqa.Game()
+        if "layouts" in sections:
+            results['layouts'] = bench_layouts(game, args.repeat)
+        if "screens" in sections:
+            results['screens'] = bench_screens(game, args.repeat)
+        game.leaderboard.close()
+        os.chdir(cwd)
+    if "questions" in sections:
+        results['questions'] = bench_questions(args.repeat)
+    if "leaderboard" in sections:
+        results['leaderboard'] = bench_leaderboard([int(size) for size in args.sizes.split(",")], args.repeat)
+    if "startup" in sections:
+        results['startup'] = measure_startup(STARTUP_RUNS)
+    pygame.quit()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)['results']
+    report(results, baseline)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'environment': environment(), 'results': results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
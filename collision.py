@@ -0,0 +1,48 @@
+"""Collision queries against level geometry.
+
+PlatformColliders builds a level's platform rects once and tests them in a
+single Rect.collidelistall call, with a UniformGrid broad phase on large
+levels. DoorColliders keeps a live list of unopened door rects that shrinks
+as doors open.
+"""
+
+from spatial_index import UniformGrid
+
+# Below this many platforms one collidelistall over all of them is cheaper
+# than a grid lookup (see benchmarks/bench_collision.py)
+GRID_THRESHOLD = 150
+
+
+class PlatformColliders:
+    def __init__(self, rects, grid_threshold=GRID_THRESHOLD):
+        self.rects = list(rects)
+        self.grid = UniformGrid.from_rects(self.rects) if len(self.rects) > grid_threshold else None
+
+    def hits(self, rect):
+        """Platform rects colliding with rect, in level order."""
+        candidates = self.grid.query(rect) if self.grid is not None else self.rects
+        return [candidates[i] for i in rect.collidelistall(candidates)]
+
+    def __len__(self):
+        return len(self.rects)
+
+
+class DoorColliders:
+    def __init__(self, doors):
+        self.doors = [door for door in doors if not door.opened]
+        self.rects = [door.rect for door in self.doors]
+
+    def first_hit(self, rect):
+        """First unopened door colliding with rect, or None."""
+        index = rect.collidelist(self.rects)
+        return self.doors[index] if index != -1 else None
+
+    def remove(self, door):
+        """Stop testing a door once it has been opened."""
+        if door in self.doors:
+            index = self.doors.index(door)
+            del self.doors[index]
+            del self.rects[index]
+
+    def __len__(self):
+        return len(self.doors)
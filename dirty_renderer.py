@@ -0,0 +1,102 @@
+"""Dirty-rectangle presentation for the main game screen.
+
+The game tells DirtyRenderer where each moving or changing element is (and a
+small state value describing how it looks); present() repaints only the areas
+that changed since the previous frame, clipped, and pushes them with
+pygame.display.update(rects).
+
+Screen changes (overlays, level transitions, resizes) call invalidate() to
+fall back to a full repaint and flip. Frames drawn through dirty rects start
+with begin_tracking(), so the first one after a full-screen frame (which may
+have covered the whole window) is repainted in full too.
+"""
+
+import pygame
+
+from profiler import NO_PHASE
+
+
+class DirtyRenderer:
+    def __init__(self, screen, profiler=None):
+        self.screen = screen
+        # Times the push to the display (see profiler.py)
+        self.profiler = profiler
+        self.sprites = {}  # key -> (rect, state) as last presented
+        self.dirty = []
+        self.full_redraw = True
+        # Whether this frame / the last presented frame went through track()
+        self.tracking = False
+        self.tracked_last = False
+
+    def invalidate(self):
+        """Repaint the whole window on the next present()."""
+        self.full_redraw = True
+
+    def begin_tracking(self):
+        """Start a frame presented through dirty rects (call before track())."""
+        self.tracking = True
+        if not self.tracked_last:
+            # The window shows some other screen - nothing tracked is on it
+            self.sprites.clear()
+            self.invalidate()
+
+    def track(self, key, rect, state=None):
+        """Record where a sprite is this frame; marks it dirty if it moved or changed."""
+        rect = pygame.Rect(rect)
+        previous = self.sprites.get(key)
+        if previous is None:
+            self.dirty.append(rect)
+        elif previous[0] != rect or previous[1] != state:
+            self.add_dirty(previous[0])
+            self.add_dirty(rect)
+        self.sprites[key] = (rect, state)
+
+    def forget(self, key):
+        previous = self.sprites.pop(key, None)
+        if previous is not None:
+            self.add_dirty(previous[0])
+
+    def add_dirty(self, rect):
+        self.dirty.append(pygame.Rect(rect))
+
+    def merged_dirty_rects(self):
+        # Coalesce overlapping rects so shared areas are only repainted once
+        merged = []
+        for rect in self.dirty:
+            rect = rect.clip(self.screen.get_rect())
+            if not rect.width or not rect.height:
+                continue
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect.union_ip(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+
+    def present(self, draw):
+        """Run draw() where needed and push the result to the display."""
+        self.tracked_last = self.tracking
+        self.tracking = False
+        if self.full_redraw:
+            draw()
+            with self.flip_phase():
+                pygame.display.flip()
+            self.full_redraw = False
+            self.dirty.clear()
+            return
+
+        if not self.dirty:
+            # Nothing changed since the last frame
+            return
+
+        rects = self.merged_dirty_rects()
+        self.dirty.clear()
+        for rect in rects:
+            self.screen.set_clip(rect)
+            draw()
+        self.screen.set_clip(None)
+        with self.flip_phase():
+            pygame.display.update(rects)
+
+    def flip_phase(self):
+        return self.profiler.phase("flip") if self.profiler is not None else NO_PHASE
@@ -0,0 +1,94 @@
+"""Wrong-answer (distractor) generation.
+
+make_distractors samples wrong answers without replacement from the valid
+values near the correct one.
+
+Strategies add plausible mistakes first - each strategy named for a level
+(see levels.py) contributes at most one distractor, and the rest come from
+nearby values. A strategy is a function (num1, num2, symbol, correct) that
+returns candidate wrong answers.
+"""
+
+import bisect
+import random
+
+from levels import OPERATIONS
+
+DISTRACTOR_COUNT = 3
+
+
+def off_by_one(num1, num2, symbol, correct):
+    return [correct - 1, correct + 1]
+
+
+def wrong_operation(num1, num2, symbol, correct):
+    # e.g. 6 × 3 answered as 6 + 3
+    return [apply(num1, num2) for other, apply in OPERATIONS.items() if other != symbol]
+
+
+def digit_swap(num1, num2, symbol, correct):
+    # e.g. 42 written as 24
+    if correct < 10:
+        return []
+    return [int(str(correct)[::-1])]
+
+
+STRATEGIES = {
+    'off_by_one': off_by_one,
+    'wrong_operation': wrong_operation,
+    'digit_swap': digit_swap,
+}
+
+
+def make_distractors(num1, num2, symbol, correct, spread, strategies=(), count=DISTRACTOR_COUNT, rng=random):
+    """count distinct non-negative wrong answers for a question.
+
+    strategies are names from STRATEGIES. Without them every wrong answer
+    within spread of the correct one is equally likely, as with the old
+    retry loop.
+    """
+    chosen = []
+    for name in strategies:
+        candidates = [wrong for wrong in STRATEGIES[name](num1, num2, symbol, correct)
+                      if wrong >= 0 and wrong != correct and wrong not in chosen]
+        if candidates and len(chosen) < count:
+            chosen.append(rng.choice(candidates))
+    return chosen + sample_nearby(correct, spread, count - len(chosen), chosen, rng)
+
+
+def sample_nearby(correct, spread, count, exclude=(), rng=random):
+    """count distinct values within spread of correct, never negative, never
+    correct and not in exclude, sampled without replacement.
+
+    If there aren't enough such values, the rest are the next values above
+    the range.
+    """
+    low = max(correct - spread, 0)
+    high = correct + spread
+    # Index space is low..high with correct (if inside) left out
+    gap = correct - low if low <= correct <= high else None
+    size = max(high - low + 1 - (gap is not None), 0)
+
+    taken = []
+    for value in exclude:
+        if low <= value <= high and value != correct:
+            index = value - low
+            taken.append(index - 1 if gap is not None and index > gap else index)
+    taken.sort()
+
+    # Each draw is a rank among the unused indices, shifted past the used ones
+    picked = []
+    for _ in range(min(count, size - len(taken))):
+        index = rng.randrange(size - len(taken))
+        for used in taken:
+            if index >= used:
+                index += 1
+        bisect.insort(taken, index)
+        picked.append(low + index + 1 if gap is not None and index >= gap else low + index)
+
+    value = max(high + 1, 0)
+    while len(picked) < count:
+        if value != correct and value not in exclude:
+            picked.append(value)
+        value += 1
+    return picked
@@ -0,0 +1,39 @@
+"""pygame startup and display helpers.
+
+start_engine() initializes only what the game uses - display (with events and
+the keyboard), fonts and, if wanted, audio. A machine without a working audio
+device still starts, without sound.
+"""
+
+import logging
+
+import pygame
+
+log = logging.getLogger(__name__)
+
+
+def start_engine(audio=True):
+    """Initialize display, fonts and (optionally) audio; safe to call again.
+    Returns whether audio is available."""
+    if not pygame.display.get_init():
+        pygame.display.init()
+    if not pygame.font.get_init():
+        pygame.font.init()
+    if audio and not pygame.mixer.get_init():
+        try:
+            pygame.mixer.init()
+        except pygame.error as error:
+            log.warning("No audio device, playing without sound: %s", error)
+    return audio_available()
+
+
+def audio_available():
+    return pygame.mixer.get_init() is not None
+
+
+def to_display_format(surface, alpha=False):
+    """surface in the display's pixel format, so blits skip per-pixel
+    conversion; unchanged while there is no display."""
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
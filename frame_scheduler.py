@@ -0,0 +1,56 @@
+"""Frame pacing that idles when nothing is happening.
+
+FrameScheduler
+
+- blocks in pygame.event.wait() on screens that only change on input
+  (questions, leaderboard, name entry), waking at least every idle_timeout_ms
+  so data arriving in the background (e.g. a shared leaderboard) still shows;
+- drops to background_fps while the window doesn't have focus;
+- skips drawing while the window is minimized.
+"""
+
+import pygame
+
+# Longest a static screen sleeps without an event
+IDLE_TIMEOUT_MS = 500
+
+
+class FrameScheduler:
+    def __init__(self, clock, fps, background_fps, idle_timeout_ms=IDLE_TIMEOUT_MS):
+        self.clock = clock
+        self.fps = fps
+        self.background_fps = background_fps
+        self.idle_timeout_ms = idle_timeout_ms
+        self.focused = True
+        self.minimized = False
+
+    def wait(self, idle):
+        """Events that arrived while idle (blocking until one does), or [] if
+        the current screen isn't idle."""
+        if not idle:
+            return []
+        event = pygame.event.wait(self.idle_timeout_ms)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event]
+
+    def handle_event(self, event):
+        """Track focus and minimizing; True if the window needs a full repaint."""
+        if event.type == pygame.WINDOWFOCUSLOST:
+            self.focused = False
+        elif event.type == pygame.WINDOWFOCUSGAINED:
+            self.focused = True
+            return True
+        elif event.type == pygame.WINDOWMINIMIZED:
+            self.minimized = True
+        elif event.type in (pygame.WINDOWRESTORED, pygame.WINDOWMAXIMIZED):
+            self.minimized = False
+            return True
+        return False
+
+    def should_render(self):
+        return not self.minimized
+
+    def tick(self):
+        """Wait out the rest of the frame; returns milliseconds since the last tick."""
+        return self.clock.tick(self.fps if self.focused and not self.minimized else self.background_fps)
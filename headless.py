@@ -0,0 +1,318 @@
+"""Headless simulation mode.
+
+Runs the game logic with SDL's dummy video and audio drivers and no rendering,
+stepping the fixed-timestep simulation as fast as the CPU allows instead of in
+real time. Used for scripted regression and balancing playthroughs:
+
+    python headless.py --runs 200 --accuracy 0.8 --seed 1
+
+Import this module before math_quiz_adventure_enhanced (it sets the SDL
+drivers before the game starts pygame).
+"""
+
+import argparse
+import os
+import random
+import time
+
+# Must be set before pygame initializes
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+# Bot playthroughs aren't real sessions
+os.environ.setdefault("MATH_QUIZ_TELEMETRY", "")
+
+import pygame
+
+import math_quiz_adventure_enhanced as mqa
+from recording import KeyState
+
+# Give up on a playthrough after this many simulation steps (~10 minutes)
+DEFAULT_MAX_STEPS = 10 * 60 * mqa.SIM_STEPS_PER_SECOND
+# Let the bot place the player at its door after this many steps without one
+DEFAULT_ASSIST_AFTER = 20 * mqa.SIM_STEPS_PER_SECOND
+
+ANSWER_KEYS = [pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4]
+
+# How close (px) the bot gets to its target before stopping, and how high
+# and far it assumes a jump reaches
+PLAYER_REACH = 10
+JUMP_REACH = 120
+CLIMB_REACH = 160
+JUMP_DISTANCE = 240
+JUMP_GAP = 160
+
+GROUND = [0, mqa.SCREEN_HEIGHT - 50, mqa.SCREEN_WIDTH, 50]
+
+NO_KEYS = KeyState()
+
+
+def key_event(key, unicode=""):
+    return pygame.event.Event(pygame.KEYDOWN, key=key, unicode=unicode, mod=0, scancode=0)
+
+
+class DoorBot:
+    """Scripted player.
+
+    Picks a closed door, climbs platforms toward it with a coarse jump model
+    and answers each question correctly with the given probability. The
+    route finding is best-effort; if no door opens for assist_after steps
+    the bot puts the player next to its door so question and scoring runs
+    always finish (pass None to disable). Called once per step; returns
+    (keys, events).
+    """
+
+    def __init__(self, name="Bot", accuracy=1.0, rng=None, assist_after=DEFAULT_ASSIST_AFTER):
+        self.name = name
+        self.accuracy = accuracy
+        self.rng = rng or random.Random()
+        self.assist_after = assist_after
+        self.assists = 0
+        self.steps_without_door = 0
+        self.answers_given = 0
+        self.last_x = None
+        self.stuck_steps = 0
+        self.surface = GROUND
+        self.platform = None
+        self.door = None
+
+    def __call__(self, game):
+        if game.show_name_input_start:
+            events = [key_event(ord(ch), ch) for ch in self.name]
+            return NO_KEYS, events + [key_event(pygame.K_RETURN, "\r")]
+
+        if game.show_question:
+            if game.question_result:
+                return NO_KEYS, [key_event(pygame.K_SPACE, " ")]
+            index = game.current_question.correct_index
+            if self.rng.random() >= self.accuracy:
+                index = self.rng.choice([i for i in range(4) if i != index])
+            self.answers_given += 1
+            self.steps_without_door = 0
+            return NO_KEYS, [key_event(ANSWER_KEYS[index])]
+
+        if game.level_completed and not game.show_level_transition:
+            return NO_KEYS, [key_event(pygame.K_SPACE, " ")]
+
+        self.steps_without_door += 1
+        if self.assist_after is not None and self.steps_without_door > self.assist_after and self.door is not None:
+            # Stuck - stand the player right next to the door
+            game.player.x = self.door.x - game.player.width / 2
+            game.player.y = self.door.y + self.door.height - game.player.height
+            game.player.vel_y = 0
+            self.assists += 1
+            self.steps_without_door = 0
+
+        return self.steer(game), []
+
+    def steer(self, game):
+        player = game.player
+        closed = [door for door in game.doors if not door.opened]
+        if not closed:
+            return NO_KEYS
+
+        player_cx = player.x + player.width / 2
+        player_bottom = player.y + player.height
+        # Stick with a door until it's open so the route doesn't flip-flop
+        if self.door not in closed:
+            self.door = min(closed, key=lambda d: abs(d.x + d.width / 2 - player_cx) + abs(d.y + d.height - player_bottom))
+        door = self.door
+        door_cx = door.x + door.width / 2
+
+        # Only re-plan on the ground so a jump in progress keeps its target
+        if player.on_ground:
+            self.surface = self.surface_under(game)
+            self.platform = self.next_hop(game, door)
+
+        if self.platform is None:
+            target_x = door_cx
+            # Take off about half a jump before the door so we're at the top of the arc there
+            gap = horizontal_gap((player.x, player.y, player.width, player.height), (door.x, door.y, door.width, door.height))
+            jump = door.y + door.height < player_bottom and (gap <= JUMP_DISTANCE / 4 or self.at_edge(game, door_cx))
+        elif self.platform[1] < player_bottom:
+            target_x, jump = self.climb(game, self.platform)
+        else:
+            # Same height or below - walk (and hop gaps) over to the part of
+            # it nearest the door
+            x, _, width, _ = self.platform
+            target_x = min(max(door_cx, x + player.width / 2), x + width - player.width / 2)
+            surface_x, surface_top, surface_width, _ = self.surface
+            if surface_top < self.platform[1] and surface_x - player.width / 2 < target_x < surface_x + surface_width + player.width / 2:
+                # It's right below us - step off the nearer edge
+                left_edge = surface_x - player.width
+                right_edge = surface_x + surface_width + player.width
+                target_x = left_edge if player_cx - left_edge < right_edge - player_cx else right_edge
+            jump = False
+
+        pressed = []
+        dx = target_x - player_cx
+        if dx < -PLAYER_REACH:
+            pressed.append(pygame.K_LEFT)
+        elif dx > PLAYER_REACH:
+            pressed.append(pygame.K_RIGHT)
+
+        # Count steps without horizontal progress to get over obstacles
+        if self.last_x is not None and player.x == self.last_x and pressed:
+            self.stuck_steps += 1
+        else:
+            self.stuck_steps = 0
+        self.last_x = player.x
+
+        if jump or self.stuck_steps > 10:
+            pressed.append(pygame.K_UP)
+        return KeyState(pressed)
+
+    def next_hop(self, game, door):
+        """First platform on the shortest climb to a surface the door is reachable from.
+
+        Surfaces are the platforms plus the ground; returns None when the door
+        can be reached from where the player stands (or no route is known).
+        """
+        player = game.player
+        ground = GROUND
+        surfaces = [ground] + list(game.platforms)
+        start = self.surface_under(game)
+
+        # A door standing on a platform is reached by getting onto that platform
+        door_rect = (door.x, door.y, door.width, door.height)
+        home = next((s for s in surfaces if s[1] == door.y + door.height and horizontal_gap(s, door_rect) == 0), None)
+
+        def reaches_door(surface):
+            if home is not None:
+                return surface is home
+            if door.y >= surface[1]:
+                # Entirely below this surface
+                return False
+            # The player's head only has to reach the bottom of the door
+            return (surface[1] - JUMP_REACH - player.height < door.y + door.height
+                    and horizontal_gap(surface, door_rect) <= JUMP_GAP)
+
+        # Breadth-first search over surfaces by jump/drop reachability
+        previous = {id(start): None}
+        queue = [start]
+        while queue:
+            surface = queue.pop(0)
+            if reaches_door(surface):
+                hop = surface
+                while previous[id(hop)] is not start and previous[id(hop)] is not None:
+                    hop = previous[id(hop)]
+                return None if hop is start else hop
+            for other in surfaces:
+                if id(other) in previous or horizontal_gap(surface, other) > JUMP_GAP:
+                    continue
+                if other[1] >= surface[1] - CLIMB_REACH:
+                    previous[id(other)] = surface
+                    queue.append(other)
+        return None
+
+    def surface_under(self, game):
+        player = game.player
+        player_bottom = player.y + player.height
+        return next((p for p in game.platforms
+                     if abs(p[1] - player_bottom) < 1 and p[0] - player.width < player.x < p[0] + p[2]), GROUND)
+
+    def at_edge(self, game, target_x):
+        """True if the next two steps toward target_x walk off the surface we're on.
+
+        Two, because on_ground (and so jumping) is only set every other step
+        while standing still on a platform.
+        """
+        player = game.player
+        x, _, width, _ = self.surface_under(game)
+        lookahead = 2 * mqa.PLAYER_SPEED
+        if target_x < player.x:
+            return player.x + player.width - lookahead <= x
+        return player.x + lookahead >= x + width
+
+    def climb(self, game, platform):
+        """Target x and jump flag for getting on top of platform from beside it."""
+        player = game.player
+        x, top, width, _ = platform
+        player_cx = player.x + player.width / 2
+        player_bottom = player.y + player.height
+        center = x + width / 2
+        if player.y < top and player_bottom < self.surface[1] - 1:
+            # Jumped and head above it - drift over the middle and land (the player
+            # lands on anything its top clears)
+            return center, False
+        if player.vel_y < 0:
+            # Rising beside it - close in, but don't get under it and bump our head
+            step = mqa.PLAYER_SPEED if center > player_cx else -mqa.PLAYER_SPEED
+            if horizontal_gap((player.x + step, player.y, player.width, player.height), platform) > 0:
+                return center, False
+            return player_cx, False
+
+        # Jump from just outside an edge with clear headroom, nearest first
+        spots = [x - player.width / 2 - PLAYER_REACH, x + width + player.width / 2 + PLAYER_REACH]
+        spots.sort(key=lambda spot: abs(player_cx - spot))
+        others = [p for p in game.platforms if p is not platform]
+        spot = next((spot for spot in spots
+                     if pygame.Rect(spot - player.width / 2, player_bottom - JUMP_REACH - player.height,
+                                    player.width, JUMP_REACH).collidelist(others) == -1), spots[0])
+        # Take off at the spot, or at the edge of our surface if the spot is past it
+        return spot, abs(player_cx - spot) <= PLAYER_REACH or self.at_edge(game, spot)
+
+
+def horizontal_gap(a, b):
+    return max(a[0] - (b[0] + b[2]), b[0] - (a[0] + a[2]), 0)
+
+
+def play(game, policy, max_steps=DEFAULT_MAX_STEPS):
+    """Run one scripted playthrough without rendering and summarize it."""
+    # Same as pressing R in the game
+    game.reset_game()
+    game.show_leaderboard = False
+    game.show_name_input = False
+    game.player_name = ""
+    game.running = True
+    steps = 0
+    while game.running and not game.game_won and steps < max_steps:
+        keys, events = policy(game)
+        for event in events:
+            game.handle_event(event)
+        game.step(keys)
+        steps += 1
+    return {
+        'steps': steps,
+        'won': game.game_won,
+        'level': game.current_level,
+        'score': game.score,
+        'doors_opened': sum(1 for door in game.doors if door.opened),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run scripted headless playthroughs")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--accuracy", type=float, default=1.0)
+    parser.add_argument("--max-steps", type=int, default=DEFAULT_MAX_STEPS)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--no-assist", action="store_true", help="never place the player at a door")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    game = mqa.Game(seed=args.seed)
+    results = []
+    start = time.perf_counter()
+    for _ in range(args.runs):
+        bot = DoorBot(accuracy=args.accuracy, rng=rng, assist_after=None if args.no_assist else DEFAULT_ASSIST_AFTER)
+        result = play(game, bot, args.max_steps)
+        result['assists'] = bot.assists
+        results.append(result)
+    elapsed = time.perf_counter() - start
+
+    total_steps = sum(r['steps'] for r in results)
+    wins = sum(1 for r in results if r['won'])
+    print(f"{args.runs} playthroughs in {elapsed:.2f}s "
+          f"({args.runs / elapsed:.1f} runs/s, {total_steps / elapsed:,.0f} steps/s)")
+    print(f"won: {wins}/{args.runs}  "
+          f"avg score: {sum(r['score'] for r in results) / args.runs:.1f}  "
+          f"avg level reached: {sum(r['level'] for r in results) / args.runs:.2f}  "
+          f"assists: {sum(r['assists'] for r in results)}")
+    game.leaderboard.close()
+    game.telemetry.close()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
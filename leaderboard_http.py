@@ -0,0 +1,186 @@
+"""Leaderboard client for leaderboard_service.
+
+HttpStore is a Leaderboard store that never touches the network on the
+caller's thread. A background thread sends submitted results in batches over
+one keep-alive connection and refreshes a cached top list when it is older
+than the TTL; add() and top() only touch memory.
+
+When the service can't be reached, results are saved to a local fallback
+store (normally the JsonLinesStore the game would use anyway) and top()
+serves the fallback's ranking until the service answers again. Results
+saved locally during an outage stay local.
+"""
+
+import http.client
+import json
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+
+DEFAULT_URL = "http://127.0.0.1:8765"
+# Seconds a fetched top list is served before refetching
+CACHE_TTL = 5.0
+# Seconds to gather submissions into one request
+BATCH_INTERVAL = 0.5
+# Seconds before a request to the service is given up
+REQUEST_TIMEOUT = 2.0
+# Seconds to wait before trying an unreachable service again
+RETRY_INTERVAL = 10.0
+# Results fetched per refresh - enough for any limit the game asks for
+FETCH_LIMIT = 10
+
+log = logging.getLogger(__name__)
+
+
+class ServiceUnavailable(Exception):
+    pass
+
+
+class HttpStore:
+    def __init__(self, url=DEFAULT_URL, fallback=None, ttl=CACHE_TTL, batch_interval=BATCH_INTERVAL,
+                 timeout=REQUEST_TIMEOUT):
+        url = urlparse(url)
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.fallback = fallback
+        self.ttl = ttl
+        self.batch_interval = batch_interval
+        self.timeout = timeout
+        self.connection = None
+
+        # State shared with the network thread
+        self.lock = threading.Lock()
+        self.outbox = []
+        self.cached = None
+        self.cached_at = None
+        self.online = True
+        self.retry_at = 0
+        # Fetch the ranking only when someone looks at it (and once up front)
+        self.wanted = True
+        self.wake = threading.Event()
+        self.closing = False
+        self.thread = threading.Thread(target=self.work, name="leaderboard-http", daemon=True)
+        self.thread.start()
+
+    def add(self, entry):
+        with self.lock:
+            self.outbox.append(entry)
+        self.wake.set()
+
+    def top(self, limit=10):
+        """Cached service ranking (or the fallback's when offline) plus
+        results not sent yet."""
+        with self.lock:
+            online = self.online
+            scores = list(self.cached or [])
+            unsent = list(self.outbox)
+            if self.cached_at is None or time.monotonic() - self.cached_at > self.ttl:
+                self.wanted = True
+                self.wake.set()
+        if not online and self.fallback is not None:
+            scores = self.fallback.top(limit)
+        # Stable sort keeps unsent (newer) results behind equal stored ones
+        scores = sorted(scores + unsent, key=lambda e: (e['score'], e['level']), reverse=True)
+        return scores[:limit]
+
+    def work(self):
+        while True:
+            self.wake.wait(self.batch_interval)
+            self.wake.clear()
+            if self.closing:
+                self.send_outbox()
+                return
+            if not self.online and time.monotonic() < self.retry_at:
+                self.save_locally()
+                continue
+            self.send_outbox()
+            with self.lock:
+                stale = self.cached_at is None or time.monotonic() - self.cached_at > self.ttl
+                refresh = stale and self.wanted
+                self.wanted = False
+            if refresh:
+                self.refresh()
+
+    def send_outbox(self):
+        with self.lock:
+            batch, self.outbox = self.outbox, []
+        if not batch:
+            return
+        try:
+            self.request("POST", "/scores", batch)
+        except ServiceUnavailable:
+            self.save_locally(batch)
+            return
+        # The cached ranking may be missing them now
+        with self.lock:
+            self.cached_at = None
+
+    def save_locally(self, batch=None):
+        if batch is None:
+            with self.lock:
+                batch, self.outbox = self.outbox, []
+        if self.fallback is None:
+            if batch:
+                log.warning("Leaderboard service unavailable, dropping %d results", len(batch))
+            return
+        for entry in batch:
+            self.fallback.add(entry)
+
+    def refresh(self):
+        try:
+            scores = self.request("GET", f"/scores?limit={FETCH_LIMIT}")
+        except ServiceUnavailable:
+            return
+        with self.lock:
+            self.cached = scores
+            self.cached_at = time.monotonic()
+
+    def request(self, method, path, body=None):
+        """Send one request over the kept-alive connection; returns the JSON reply."""
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8') if body is not None else None
+        headers = {'Content-Type': 'application/json'} if data is not None else {}
+        # A kept-alive connection the server already closed fails once; retry on a fresh one
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self.connection.request(method, path, body=data, headers=headers)
+                response = self.connection.getresponse()
+                reply = response.read()
+                if response.status != 200:
+                    raise ServiceUnavailable(f"{method} {path}: HTTP {response.status}")
+                result = json.loads(reply)
+            except (OSError, http.client.HTTPException, ValueError) as error:
+                self.connection.close()
+                self.connection = None
+                if attempt == 0 and isinstance(error, (http.client.RemoteDisconnected, ConnectionResetError,
+                                                       BrokenPipeError)):
+                    continue
+                self.went_offline(error)
+                raise ServiceUnavailable(str(error)) from error
+            except ServiceUnavailable as error:
+                self.went_offline(error)
+                raise
+            with self.lock:
+                if not self.online:
+                    log.info("Leaderboard service is back")
+                self.online = True
+            return result
+
+    def went_offline(self, error):
+        with self.lock:
+            if self.online:
+                log.warning("Leaderboard service unavailable, using local scores: %s", error)
+            self.online = False
+            self.retry_at = time.monotonic() + RETRY_INTERVAL
+
+    def close(self):
+        """Send what's left (giving up after the request timeout) and stop."""
+        self.closing = True
+        self.wake.set()
+        self.thread.join(self.timeout * 2)
+        if self.connection is not None:
+            self.connection.close()
+        if self.fallback is not None:
+            self.fallback.close()
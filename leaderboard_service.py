@@ -0,0 +1,145 @@
+"""Leaderboard HTTP service.
+
+Shares one leaderboard between the machines in a lab. Games talk to it
+through leaderboard_http.HttpStore; the service keeps the results in a
+JsonLinesStore or SQLiteStore on its own disk:
+
+    python leaderboard_service.py --port 8765 --backend sqlite
+
+API (JSON, HTTP/1.1 keep-alive):
+
+    GET  /scores?limit=10   top results, best first
+    POST /scores            a list of result entries to add
+"""
+
+import argparse
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from leaderboard_sqlite import DEFAULT_DB_FILE, SQLiteStore
+from leaderboard_store import DEFAULT_LOG_FILE, JsonLinesStore
+from persistence import BackgroundWriter
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_LIMIT = 100
+# Largest accepted request body
+MAX_BODY_BYTES = 1024 * 1024
+ENTRY_FIELDS = {'name': str, 'score': int, 'level': int, 'date': str}
+
+log = logging.getLogger(__name__)
+
+
+def valid_entry(entry):
+    # bool is an int subclass, but true/false aren't scores or levels
+    return isinstance(entry, dict) and all(isinstance(entry.get(field), kind) and not isinstance(entry.get(field), bool)
+                                           for field, kind in ENTRY_FIELDS.items())
+
+
+class LeaderboardHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/scores":
+            self.send_json(404, {'error': "not found"})
+            return
+        try:
+            limit = int(parse_qs(url.query).get('limit', ["10"])[0])
+        except ValueError:
+            self.send_json(400, {'error': "limit must be a number"})
+            return
+        limit = max(1, min(limit, MAX_LIMIT))
+        with self.server.lock:
+            scores = self.server.store.top(limit)
+        self.send_json(200, scores)
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/scores":
+            self.send_json(404, {'error': "not found"})
+            return
+        if self.headers.get('Content-Length') is None:
+            self.send_json(411, {'error': "Content-Length required"})
+            self.close_connection = True
+            return
+        try:
+            length = int(self.headers['Content-Length'])
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.send_json(400, {'error': "invalid Content-Length"})
+            self.close_connection = True
+            return
+        if length > MAX_BODY_BYTES:
+            self.send_json(413, {'error': "too large"})
+            self.close_connection = True
+            return
+        try:
+            entries = json.loads(self.rfile.read(length))
+        except ValueError:
+            self.send_json(400, {'error': "invalid JSON"})
+            return
+        if not isinstance(entries, list) or not all(valid_entry(entry) for entry in entries):
+            self.send_json(400, {'error': "expected a list of {name, score, level, date}"})
+            return
+        with self.server.lock:
+            for entry in entries:
+                self.server.store.add({field: entry[field] for field in ENTRY_FIELDS})
+        self.send_json(200, {'added': len(entries)})
+
+    def send_json(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        log.info("%s %s", self.address_string(), format % args)
+
+
+class LeaderboardServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, store):
+        super().__init__(address, LeaderboardHandler)
+        self.store = store
+        # Request threads take turns with the store
+        self.lock = threading.Lock()
+
+
+def open_store(backend, path=None):
+    writer = BackgroundWriter()
+    if backend == "sqlite":
+        return SQLiteStore(path or DEFAULT_DB_FILE, writer=writer), writer
+    return JsonLinesStore(path or DEFAULT_LOG_FILE, writer=writer), writer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a shared leaderboard over HTTP")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--backend", choices=["jsonl", "sqlite"], default="jsonl")
+    parser.add_argument("--path", help="leaderboard file (default depends on the backend)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    store, writer = open_store(args.backend, args.path)
+    server = LeaderboardServer((args.host, args.port), store)
+    log.info("Serving leaderboard on http://%s:%d", args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        store.close()
+        writer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""SQLite leaderboard storage.
+
+A drop-in store for Leaderboard (same add/top/close as JsonLinesStore) for
+schools with many students. Every result is a row in `scores`; a trigger
+keeps each player's best result in `best_scores`, so per-student queries
+don't scan the full history. Indexes cover the ranking order, level, player
+name and date:
+
+    store = SQLiteStore("leaderboard.db")
+    store.top_since(start_of_week(), 10)   # top 10 this week
+    store.best_per_player(10)              # best result per student
+    store.rank_of("Ann")                   # Ann's place among students
+
+With a BackgroundWriter (see persistence.py), add() commits on the writer
+thread over its own connection; reads see a result once it's committed.
+"""
+
+import json
+import sqlite3
+from datetime import datetime, timedelta
+
+from persistence import ImmediateWriter
+
+DEFAULT_DB_FILE = "leaderboard.db"
+# Matches the 'date' field Leaderboard writes; sorts chronologically as text
+DATE_FORMAT = '%Y-%m-%d %H:%M'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    date TEXT NOT NULL
+);
+-- date is included so date-filtered rankings never touch the table
+CREATE INDEX IF NOT EXISTS scores_rank ON scores (score DESC, level DESC, id, date);
+CREATE INDEX IF NOT EXISTS scores_level ON scores (level, score DESC);
+CREATE INDEX IF NOT EXISTS scores_name ON scores (name, score DESC, level DESC);
+CREATE INDEX IF NOT EXISTS scores_date ON scores (date);
+
+CREATE TABLE IF NOT EXISTS best_scores (
+    name TEXT PRIMARY KEY,
+    score INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    score_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS best_scores_rank ON best_scores (score DESC, level DESC, score_id);
+
+CREATE TRIGGER IF NOT EXISTS scores_best AFTER INSERT ON scores BEGIN
+    INSERT INTO best_scores (name, score, level, date, score_id)
+    VALUES (NEW.name, NEW.score, NEW.level, NEW.date, NEW.id)
+    ON CONFLICT (name) DO UPDATE SET
+        score = excluded.score, level = excluded.level,
+        date = excluded.date, score_id = excluded.score_id
+    WHERE (excluded.score, excluded.level) > (best_scores.score, best_scores.level);
+END;
+"""
+
+RANK_ORDER = "ORDER BY score DESC, level DESC"
+
+
+def start_of_week(now=None):
+    """Monday 00:00 of the current week, for top_since."""
+    now = now or datetime.now()
+    monday = now - timedelta(days=now.weekday())
+    return monday.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def row_entry(row):
+    return {'name': row[0], 'score': row[1], 'level': row[2], 'date': row[3]}
+
+
+class SQLiteStore:
+    def __init__(self, path=DEFAULT_DB_FILE, legacy_path=None, writer=None):
+        """legacy_path is an old leaderboard.json to import into a new database."""
+        self.path = path
+        self.writer = writer if writer is not None else ImmediateWriter()
+        self.db = self.connect()
+        # Connection owned by whichever thread runs the writer's jobs
+        self.write_db = None
+        is_new = self.db.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE name = 'scores'").fetchone()[0] == 0
+        self.db.executescript(SCHEMA)
+        if is_new and legacy_path is not None:
+            self.migrate(legacy_path)
+
+    def connect(self):
+        # Callers serialize access, so a connection may be handed between threads
+        db = sqlite3.connect(self.path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        # WAL makes NORMAL safe against corruption; a power cut can only lose the last commits
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def migrate(self, legacy_path):
+        try:
+            with open(legacy_path, 'r') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        entries.sort(key=lambda e: e.get('date', ''))
+        self.add_many(entries)
+
+    def add(self, entry):
+        self.writer.submit(self.insert, entry)
+
+    def insert(self, entry):
+        if self.write_db is None:
+            self.write_db = self.connect()
+        with self.write_db:
+            self.write_db.execute("INSERT INTO scores (name, score, level, date) VALUES (?, ?, ?, ?)",
+                                  (entry['name'], entry['score'], entry['level'], entry['date']))
+
+    def add_many(self, entries):
+        with self.db:
+            self.db.executemany("INSERT INTO scores (name, score, level, date) VALUES (?, ?, ?, ?)",
+                                ((e['name'], e['score'], e['level'], e['date']) for e in entries))
+
+    def top(self, limit=10, level=None):
+        """Best results overall (or on one level); ties go to the earlier result."""
+        if level is None:
+            rows = self.db.execute(f"SELECT name, score, level, date FROM scores {RANK_ORDER}, id LIMIT ?",
+                                   (limit,))
+        else:
+            rows = self.db.execute("SELECT name, score, level, date FROM scores WHERE level = ? "
+                                   "ORDER BY score DESC, id LIMIT ?", (level, limit))
+        return [row_entry(row) for row in rows]
+
+    def top_since(self, since, limit=10):
+        """Best results dated at or after since (a datetime)."""
+        rows = self.db.execute(f"SELECT name, score, level, date FROM scores WHERE date >= ? {RANK_ORDER}, id LIMIT ?",
+                               (since.strftime(DATE_FORMAT), limit))
+        return [row_entry(row) for row in rows]
+
+    def best_per_player(self, limit=10):
+        """Each player's best result, best players first."""
+        rows = self.db.execute(f"SELECT name, score, level, date FROM best_scores {RANK_ORDER}, score_id LIMIT ?",
+                               (limit,))
+        return [row_entry(row) for row in rows]
+
+    def player_scores(self, name, limit=10):
+        rows = self.db.execute(f"SELECT name, score, level, date FROM scores WHERE name = ? {RANK_ORDER} LIMIT ?",
+                               (name, limit))
+        return [row_entry(row) for row in rows]
+
+    def rank_of(self, name):
+        """Player's place among all players by best result (ties share a place),
+        or None if they have no results."""
+        best = self.db.execute("SELECT score, level FROM best_scores WHERE name = ?", (name,)).fetchone()
+        if best is None:
+            return None
+        better = self.db.execute("SELECT COUNT(*) FROM best_scores WHERE (score, level) > (?, ?)", best).fetchone()[0]
+        return better + 1
+
+    def close(self):
+        self.writer.submit(self.close_writes)
+        self.db.close()
+
+    def close_writes(self):
+        if self.write_db is not None:
+            self.write_db.close()
+            self.write_db = None
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
@@ -0,0 +1,241 @@
+"""Append-only leaderboard storage.
+
+Every submitted result is kept: each one is appended to a JSON-lines log as a
+single record, so a submission costs one small write however long the
+history gets. Rankings come from a bounded min-heap of the top K entries,
+rebuilt from the log on startup.
+
+Replaying a long log on every startup gets slow, so every compact_every
+submissions the store writes a snapshot of the heap together with the log
+size it covers; startup loads the snapshot and replays only the records
+after it. The log itself is never rewritten - teachers keep every run.
+
+File writes go through a writer (see persistence.py): pass a BackgroundWriter
+to keep them off the game loop. The in-memory ranking updates immediately
+either way.
+
+Several game instances may share one log (e.g. on a network drive). Appends
+and snapshots take an exclusive fcntl lock, and each instance merges in the
+records others appended since it last read - checked at most every
+refresh_interval seconds, and only read when the file's size or mtime
+changed.
+"""
+
+import heapq
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+from persistence import ImmediateWriter, atomic_write, file_lock, file_signature
+
+DEFAULT_LOG_FILE = "leaderboard.jsonl"
+# Entries kept in the ranking
+TOP_K = 10
+# Submissions between snapshots
+COMPACT_EVERY = 100
+# Seconds between checks for records from other instances
+REFRESH_INTERVAL = 1.0
+
+
+def snapshot_path_for(log_path):
+    return os.path.splitext(log_path)[0] + ".snapshot.json"
+
+
+class JsonLinesStore:
+    def __init__(self, path=DEFAULT_LOG_FILE, top_k=TOP_K, compact_every=COMPACT_EVERY, legacy_path=None,
+                 writer=None, refresh_interval=REFRESH_INTERVAL):
+        """legacy_path is an old leaderboard.json (a list of entries) to import
+        when the log doesn't exist yet."""
+        self.path = path
+        self.writer = writer if writer is not None else ImmediateWriter()
+        self.snapshot_path = snapshot_path_for(path)
+        self.top_k = top_k
+        self.compact_every = compact_every
+        self.refresh_interval = refresh_interval
+        # Guards the in-memory state, shared with the writer thread
+        self.lock = threading.RLock()
+        # Min-heap of (score, level, -sequence, entry): the root is the entry
+        # that drops out first - lowest score, then level, then newest
+        self.heap = []
+        self.count = 0
+        self.since_snapshot = 0
+        self.ranked = None
+        # Log bytes merged into the heap so far, and the log's signature then
+        self.offset = 0
+        self.signature = None
+        self.last_refresh = 0
+        # Our own records not yet read back from the log; they're ranked
+        # alongside the heap until then, so the heap always matches the log
+        self.pending = Counter()
+        self.log = None
+
+        if not os.path.exists(path) and legacy_path is not None:
+            self.migrate(legacy_path)
+        self.load()
+
+    def load(self):
+        with self.lock:
+            self.heap = []
+            self.count = 0
+            self.ranked = None
+            self.offset = self.load_snapshot()
+            self.signature = None
+            if os.path.exists(self.path):
+                with open(self.path, 'rb') as log:
+                    self.read_new_records(log)
+
+    def load_snapshot(self):
+        """Restore the heap from the snapshot; returns the log offset to replay from."""
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            log_size = os.path.getsize(self.path)
+        except (OSError, ValueError):
+            return 0
+        if snapshot.get('top_k') != self.top_k or snapshot['offset'] > log_size:
+            # Different ranking size, or the log was replaced - rebuild from scratch
+            return 0
+        self.count = snapshot['count']
+        self.heap = [(e['score'], e['level'], -seq, e) for seq, e in snapshot['entries']]
+        heapq.heapify(self.heap)
+        return snapshot['offset']
+
+    def migrate(self, legacy_path):
+        try:
+            with open(legacy_path, 'r') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        # Oldest first, as they would have been appended
+        entries.sort(key=lambda e: e.get('date', ''))
+        atomic_write(self.path, "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries))
+
+    def read_new_records(self, log):
+        """Merge complete records appended to the open log since offset.
+        Caller holds self.lock."""
+        self.signature = file_signature(self.path)
+        log.seek(self.offset)
+        data = log.read()
+        # A line without its newline is still being written - leave it for later
+        end = data.rfind(b"\n") + 1
+        for raw in data[:end].splitlines():
+            line = raw.decode('utf-8', errors='replace')
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # Torn write from a crash
+                continue
+            if self.pending[line] > 0:
+                # One of ours, now written
+                self.pending[line] -= 1
+                self.ranked = None
+            else:
+                self.since_snapshot += 1
+            self.push(entry)
+        # Drop zero counts
+        self.pending += Counter()
+        self.offset += end
+
+    def refresh(self, force=False):
+        """Pick up records other instances appended, if the log changed."""
+        now = time.monotonic()
+        if not force and now - self.last_refresh < self.refresh_interval:
+            return
+        self.last_refresh = now
+        signature = file_signature(self.path)
+        if signature == self.signature:
+            return
+        if signature is None or self.signature is not None and (
+                signature[0] != self.signature[0] or signature[1] < self.offset):
+            # Deleted, replaced or truncated - start over
+            self.load()
+            return
+        with open(self.path, 'rb') as log, file_lock(log, exclusive=False, blocking=False) as locked:
+            if not locked:
+                # Another instance is writing - try again next time
+                self.signature = None
+                return
+            with self.lock:
+                self.read_new_records(log)
+
+    def push(self, entry):
+        item = (entry['score'], entry['level'], -self.count, entry)
+        self.count += 1
+        if len(self.heap) < self.top_k:
+            heapq.heappush(self.heap, item)
+        elif item[:3] > self.heap[0][:3]:
+            heapq.heapreplace(self.heap, item)
+        else:
+            return
+        self.ranked = None
+
+    def add(self, entry):
+        line = json.dumps(entry, ensure_ascii=False)
+        with self.lock:
+            self.pending[line] += 1
+            self.ranked = None
+            self.since_snapshot += 1
+            compact = self.since_snapshot >= self.compact_every
+            if compact:
+                self.since_snapshot = 0
+        self.writer.submit(self.write_record, line)
+        if compact:
+            self.writer.submit(self.compact)
+
+    def write_record(self, line):
+        if self.log is None:
+            self.log = open(self.path, 'ab+')
+        log = self.log
+        with file_lock(log):
+            record = line.encode('utf-8') + b"\n"
+            log.seek(0, os.SEEK_END)
+            if log.tell() > 0:
+                log.seek(-1, os.SEEK_END)
+                if log.read(1) != b"\n":
+                    # Don't glue a record onto a torn last line
+                    record = b"\n" + record
+            log.write(record)
+            log.flush()
+            os.fsync(log.fileno())
+
+    def compact(self):
+        """Snapshot the ranking so startup only replays newer records.
+
+        Runs on the writer, after our earlier records are written.
+        """
+        with open(self.path, 'rb') as log, file_lock(log):
+            with self.lock:
+                self.read_new_records(log)
+                snapshot = {
+                    'offset': self.offset,
+                    'count': self.count,
+                    'top_k': self.top_k,
+                    'entries': [(-neg_seq, entry) for _, _, neg_seq, entry in self.heap],
+                }
+            atomic_write(self.snapshot_path, json.dumps(snapshot, ensure_ascii=False))
+
+    def top(self, limit=TOP_K):
+        self.refresh()
+        with self.lock:
+            if self.ranked is None:
+                # Unwritten records of ours rank as the newest
+                unwritten = [json.loads(line) for line in self.pending.elements()]
+                items = self.heap + [(entry['score'], entry['level'], -(self.count + i), entry)
+                                     for i, entry in enumerate(unwritten)]
+                self.ranked = [entry for *_, entry in sorted(items, key=lambda item: item[:3], reverse=True)]
+            return self.ranked[:limit]
+
+    def close(self):
+        self.writer.submit(self.close_log)
+
+    def close_log(self):
+        if self.log is not None:
+            self.log.close()
+            self.log = None
+
+    def __len__(self):
+        self.refresh(force=True)
+        with self.lock:
+            return self.count + sum(self.pending.values())
@@ -0,0 +1,47 @@
+"""Pre-composited level scenery.
+
+Within a level the sky, ground and platforms never change, and the doors only
+change when one opens. LevelLayers draws the scenery once into a static
+surface, and composites the doors over a copy of it, redone only when a door
+changes. Drawing the level is then a single blit, however many platforms it
+has.
+
+Call invalidate() when the level changes and invalidate_doors() when a door
+opens; a new window size rebuilds both layers by itself.
+"""
+
+import pygame
+
+from engine import to_display_format
+
+
+class LevelLayers:
+    def __init__(self, draw_scenery, draw_doors):
+        """draw_scenery(surface) and draw_doors(surface) paint the layers."""
+        self.draw_scenery = draw_scenery
+        self.draw_doors = draw_doors
+        self.static = None
+        self.composite = None
+        self.builds = 0
+
+    def invalidate(self):
+        self.static = None
+        self.composite = None
+
+    def invalidate_doors(self):
+        self.composite = None
+
+    def get(self, size):
+        if self.static is None or self.static.get_size() != tuple(size):
+            static = to_display_format(pygame.Surface(size))
+            self.draw_scenery(static)
+            self.static = static
+            self.composite = None
+            self.builds += 1
+        if self.composite is None:
+            self.composite = self.static.copy()
+            self.draw_doors(self.composite)
+        return self.composite
+
+    def draw(self, screen):
+        screen.blit(self.get(screen.get_size()), (0, 0))
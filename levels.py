@@ -0,0 +1,228 @@
+"""Level table.
+
+Each level is a LevelSpec: the question operations it draws from (with their
+odds, operand ranges and distractor spread), its platform and door layout,
+and its description. The table is built once at import and looked up by
+level number, so the game and question generators don't branch per level.
+
+The built-in table can be replaced by a levels.json file holding a list of
+level dicts in the same format as DEFAULT_LEVELS (see save_levels), e.g. to
+add levels 6-50 without touching code.
+"""
+
+import itertools
+import json
+import os
+import random
+
+LEVELS_FILE = "levels.json"
+
+OPERATIONS = {
+    "+": lambda a, b: a + b,
+    "-": lambda a, b: a - b,
+    "×": lambda a, b: a * b,
+}
+
+
+class Operation:
+    def __init__(self, op, weight, num1, num2, spread, non_negative=False):
+        if op not in OPERATIONS:
+            raise ValueError(f"Unknown operation {op!r}")
+        self.symbol = op
+        self.weight = weight
+        self.num1 = tuple(num1)
+        self.num2 = tuple(num2)
+        # Wrong answers are within this distance of the correct one
+        self.spread = spread
+        # Order the operands so the result is never negative
+        self.non_negative = non_negative
+        self.apply = OPERATIONS[op]
+
+    def operands(self, rng=random):
+        num1 = rng.randint(*self.num1)
+        num2 = rng.randint(*self.num2)
+        if self.non_negative and num1 < num2:
+            num1, num2 = num2, num1
+        return num1, num2
+
+    def to_dict(self):
+        data = {'op': self.symbol, 'weight': self.weight, 'num1': list(self.num1),
+                'num2': list(self.num2), 'spread': self.spread}
+        if self.non_negative:
+            data['non_negative'] = True
+        return data
+
+
+class LevelSpec:
+    def __init__(self, number, description, operations, platforms, doors, theme=None, distractors=()):
+        self.number = number
+        self.description = description
+        self.operations = [Operation(**op) for op in operations]
+        self.cum_weights = list(itertools.accumulate(op.weight for op in self.operations))
+        self.platforms = [tuple(platform) for platform in platforms]
+        # Door positions; door n asks question n
+        self.doors = [tuple(door) for door in doors]
+        # Background theme name (see background_cache.THEMES), None for the default
+        self.theme = theme
+        # Plausible-mistake strategies for wrong answers (see distractors.STRATEGIES)
+        self.distractors = tuple(distractors)
+
+    @classmethod
+    def from_dict(cls, number, data):
+        return cls(number, data['description'], data['operations'], data['platforms'],
+                   data['doors'], data.get('theme'), data.get('distractors', ()))
+
+    def pick_operation(self, rng=random):
+        return rng.choices(self.operations, cum_weights=self.cum_weights)[0]
+
+    def to_dict(self):
+        data = {
+            'description': self.description,
+            'operations': [op.to_dict() for op in self.operations],
+            'platforms': [list(platform) for platform in self.platforms],
+            'doors': [list(door) for door in self.doors],
+        }
+        if self.theme is not None:
+            data['theme'] = self.theme
+        if self.distractors:
+            data['distractors'] = list(self.distractors)
+        return data
+
+
+DEFAULT_LEVELS = [
+    {
+        # Level 1: Simple addition/subtraction (1-10), simple layout - easy jumps
+        'description': "Simple Addition & Subtraction",
+        'operations': [
+            {'op': "+", 'weight': 1, 'num1': [1, 10], 'num2': [1, 10], 'spread': 10},
+            {'op': "-", 'weight': 1, 'num1': [1, 10], 'num2': [1, 10], 'spread': 10, 'non_negative': True},
+        ],
+        'platforms': [
+            [200, 500, 150, 20],
+            [400, 400, 150, 20],
+            [600, 300, 150, 20],
+            [300, 200, 150, 20],
+            [700, 150, 150, 20],
+        ],
+        'doors': [[320, 420], [520, 220], [720, 370], [420, 120], [820, 70]],
+    },
+    {
+        # Level 2: Medium addition/subtraction (10-25), more platforms
+        'description': "Medium Problems",
+        'operations': [
+            {'op': "+", 'weight': 1, 'num1': [10, 25], 'num2': [5, 15], 'spread': 10},
+            {'op': "-", 'weight': 1, 'num1': [10, 25], 'num2': [5, 15], 'spread': 10},
+        ],
+        'platforms': [
+            [150, 450, 120, 20],
+            [350, 350, 120, 20],
+            [550, 450, 120, 20],
+            [750, 300, 120, 20],
+            [200, 250, 120, 20],
+            [500, 200, 120, 20],
+            [800, 150, 120, 20],
+        ],
+        'doors': [[270, 370], [470, 370], [670, 370], [320, 170], [920, 70]],
+    },
+    {
+        # Level 3: Larger numbers + simple multiplication, tower climbing
+        'description': "Larger Numbers + Multiplication",
+        'operations': [
+            {'op': "×", 'weight': 1, 'num1': [2, 8], 'num2': [2, 8], 'spread': 15},
+            {'op': "+", 'weight': 1, 'num1': [20, 50], 'num2': [10, 25], 'spread': 10},
+            {'op': "-", 'weight': 1, 'num1': [20, 50], 'num2': [10, 25], 'spread': 10},
+        ],
+        'platforms': [
+            [100, 500, 100, 20],
+            [300, 450, 100, 20],
+            [500, 400, 100, 20],
+            [700, 350, 100, 20],
+            [200, 300, 100, 20],
+            [400, 250, 100, 20],
+            [600, 200, 100, 20],
+            [800, 150, 100, 20],
+        ],
+        'doors': [[220, 420], [420, 370], [620, 320], [320, 220], [720, 120]],
+    },
+    {
+        # Level 4: More multiplication + larger numbers, scattered platforms
+        'description': "Advanced Multiplication",
+        'operations': [
+            {'op': "×", 'weight': 2, 'num1': [3, 12], 'num2': [3, 12], 'spread': 15},
+            {'op': "+", 'weight': 1, 'num1': [50, 100], 'num2': [20, 40], 'spread': 10},
+            {'op': "-", 'weight': 1, 'num1': [50, 100], 'num2': [20, 40], 'spread': 10},
+        ],
+        'platforms': [
+            [80, 480, 80, 20],
+            [250, 420, 80, 20],
+            [450, 380, 80, 20],
+            [650, 340, 80, 20],
+            [850, 300, 80, 20],
+            [150, 280, 80, 20],
+            [350, 220, 80, 20],
+            [550, 160, 80, 20],
+            [750, 100, 80, 20],
+        ],
+        'doors': [[170, 400], [370, 340], [570, 300], [270, 140], [870, 20]],
+    },
+    {
+        # Level 5: Advanced problems, complex maze - ultimate challenge
+        'description': "Ultimate Math Challenge!",
+        'operations': [
+            {'op': "+", 'weight': 1, 'num1': [75, 150], 'num2': [25, 75], 'spread': 10},
+            {'op': "-", 'weight': 1, 'num1': [100, 200], 'num2': [25, 75], 'spread': 10},
+            {'op': "×", 'weight': 2, 'num1': [5, 15], 'num2': [5, 15], 'spread': 15},
+        ],
+        'platforms': [
+            [50, 500, 100, 20],
+            [200, 480, 80, 20],
+            [350, 460, 80, 20],
+            [500, 440, 80, 20],
+            [650, 420, 80, 20],
+            [800, 400, 100, 20],
+            [100, 380, 80, 20],
+            [250, 360, 80, 20],
+            [400, 340, 80, 20],
+            [550, 320, 80, 20],
+            [700, 300, 80, 20],
+            [150, 260, 80, 20],
+            [300, 240, 80, 20],
+            [450, 220, 80, 20],
+            [600, 200, 80, 20],
+            [750, 180, 80, 20],
+            [200, 140, 80, 20],
+            [400, 120, 80, 20],
+            [600, 100, 80, 20],
+            [800, 80, 100, 20],
+        ],
+        'doors': [[170, 400], [320, 280], [470, 140], [520, 40], [920, 0]],
+    },
+]
+
+
+def build_levels(table):
+    return [LevelSpec.from_dict(number, data) for number, data in enumerate(table, 1)]
+
+
+def load_levels(path=LEVELS_FILE):
+    """Level table from path if it exists, otherwise the built-in one."""
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            return build_levels(json.load(f))
+    return build_levels(DEFAULT_LEVELS)
+
+
+def save_levels(levels, path=LEVELS_FILE):
+    with open(path, 'w') as f:
+        json.dump([level.to_dict() for level in levels], f, indent=2, ensure_ascii=False)
+
+
+LEVELS = load_levels()
+MAX_LEVEL = len(LEVELS)
+
+
+def level_spec(level):
+    """Spec for a level number; levels past the end reuse the last level."""
+    if 1 <= level <= MAX_LEVEL:
+        return LEVELS[level - 1]
+    return LEVELS[-1]
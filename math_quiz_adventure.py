@@ -5,9 +5,9 @@ import json
 import os
 from datetime import datetime
 
-# Initialize Pygame
-pygame.init()
-pygame.mixer.init()
+from background_cache import BackgroundCache
+from engine import start_engine
+from sound_bank import NullSoundBank, SoundBank
 
 # Constants
 SCREEN_WIDTH = 1000
@@ -283,6 +283,9 @@ class MathQuestion:
 
 class Game:
     def __init__(self):
+        # Display, fonts and audio (if there is a device) - importing the module starts nothing
+        self.audio = start_engine()
+        
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Math Quiz Adventure")
         self.clock = pygame.time.Clock()
@@ -290,8 +293,11 @@ class Game:
         self.font_medium = pygame.font.Font(None, 36)
         self.font_small = pygame.font.Font(None, 24)
         
-        # Create simple sound effects
-        self.create_sounds()
+        # Gradient background is rendered once and reused every frame
+        self.backgrounds = BackgroundCache()
+        
+        # Feedback tones, synthesized once and cached on disk
+        self.sounds = SoundBank() if self.audio else NullSoundBank()
         
         # Game state
         self.player = Player(50, SCREEN_HEIGHT - 100)
@@ -320,31 +326,6 @@ class Game:
         self.doors_opened = 0
         self.game_won = False
         
-    def create_sounds(self):
-        # Create simple beep sounds
-        try:
-            # Correct answer sound (higher pitch)
-            self.correct_sound = pygame.mixer.Sound(buffer=b'\x00\x00' * 1000)
-            # Incorrect answer sound (lower pitch)
-            self.incorrect_sound = pygame.mixer.Sound(buffer=b'\x00\x00' * 1000)
-        except:
-            self.correct_sound = None
-            self.incorrect_sound = None
-    
-    def play_correct_sound(self):
-        if self.correct_sound:
-            try:
-                self.correct_sound.play()
-            except:
-                pass
-    
-    def play_incorrect_sound(self):
-        if self.incorrect_sound:
-            try:
-                self.incorrect_sound.play()
-            except:
-                pass
-    
     def check_door_collision(self):
         player_rect = pygame.Rect(self.player.x, self.player.y, self.player.width, self.player.height)
         for door in self.doors:
@@ -384,14 +365,16 @@ class Game:
     def check_answer(self, selected_index):
         if selected_index == self.current_question.correct_index:
             self.question_result = "correct"
-            self.play_correct_sound()
             self.current_door.opened = True
             self.doors_opened += 1
             if self.doors_opened >= len(self.doors):
                 self.game_won = True
+                self.sounds.play('level_complete')
+            else:
+                self.sounds.play('correct')
         else:
             self.question_result = "incorrect"
-            self.play_incorrect_sound()
+            self.sounds.play('incorrect')
     
     def draw_question(self):
         # Semi-transparent overlay
@@ -453,13 +436,8 @@ class Game:
             self.screen.blit(result_text, result_rect)
     
     def draw_background(self):
-        # Gradient background
-        for y in range(SCREEN_HEIGHT):
-            color_ratio = y / SCREEN_HEIGHT
-            r = int(135 + (255 - 135) * color_ratio)
-            g = int(206 + (255 - 206) * color_ratio)
-            b = int(235 + (255 - 235) * color_ratio)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (SCREEN_WIDTH, y))
+        # Cached gradient background - a single blit
+        self.backgrounds.draw(self.screen)
     
     def draw_platforms(self):
         for platform in self.platforms:
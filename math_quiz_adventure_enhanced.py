@@ -1,19 +1,49 @@
 import pygame
 import random
 import math
-import json
 import os
+import time
 from datetime import datetime
 
-# Initialize Pygame
-pygame.init()
-pygame.mixer.init()
+from background_cache import BackgroundCache, DEFAULT_THEME
+from collision import DoorColliders, PlatformColliders
+from dirty_renderer import DirtyRenderer
+from distractors import make_distractors
+from engine import start_engine
+from frame_scheduler import FrameScheduler
+from leaderboard_store import JsonLinesStore
+from level_layers import LevelLayers
+from levels import LEVELS, MAX_LEVEL, level_spec
+from persistence import BackgroundWriter
+from profiler import FrameProfiler
+from question_pool import QuestionPool
+from recording import Recorder
+from sound_bank import NullSoundBank, SoundBank
+from sprite_atlas import SpriteAtlas
+from surface_pool import get_overlay
+from telemetry import NullTelemetry, Telemetry
+from text_cache import render_text
 
 # Constants
 SCREEN_WIDTH = 1000
 SCREEN_HEIGHT = 600
 FPS = 60
 
+# Fixed simulation timestep - game logic always advances in these steps,
+# whatever the render frame rate
+SIM_STEPS_PER_SECOND = 60
+SIM_STEP_SECONDS = 1 / SIM_STEPS_PER_SECOND
+MAX_STEPS_PER_FRAME = 5
+# Frame rate while the window is in the background - the lowest at which
+# MAX_STEPS_PER_FRAME steps still keep up with real time
+BACKGROUND_FPS = SIM_STEPS_PER_SECOND // MAX_STEPS_PER_FRAME
+LEVEL_TRANSITION_STEPS = 3 * SIM_STEPS_PER_SECOND
+
+# Font sizes
+FONT_SMALL = 24
+FONT_MEDIUM = 36
+FONT_LARGE = 48
+
 # Colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -32,14 +62,35 @@ GRAVITY = 0.8
 JUMP_STRENGTH = -15
 PLAYER_SPEED = 5
 
+# Player blinks for BLINK_STEPS out of every BLINK_EVERY simulation steps
+BLINK_EVERY = 3 * SIM_STEPS_PER_SECOND
+BLINK_STEPS = 8
+
 # Points system
 POINTS_PER_CORRECT = 10
 BONUS_POINTS_MULTIPLIER = 2
-QUESTIONS_PER_LEVEL = 5
 LEVEL_COMPLETION_BONUS = 50
 
-# Leaderboard file
+# Leaderboard files - every result is logged; the old top-10 file is
+# imported into the log the first time
+LEADERBOARD_LOG_FILE = "leaderboard.jsonl"
+LEADERBOARD_DB_FILE = "leaderboard.db"
 LEADERBOARD_FILE = "leaderboard.json"
+# Leaderboard storage: "jsonl" (default), "sqlite" for large schools, or
+# "http" for a shared leaderboard_service at LEADERBOARD_URL
+LEADERBOARD_BACKEND = os.environ.get("MATH_QUIZ_LEADERBOARD", "jsonl")
+LEADERBOARD_URL = os.environ.get("MATH_QUIZ_LEADERBOARD_URL", "http://127.0.0.1:8765")
+
+# Play events (doors, questions, answer times) for teachers; set to "" to turn off
+TELEMETRY_FILE = os.environ.get("MATH_QUIZ_TELEMETRY", "telemetry.jsonl")
+
+# Frame profiler: on from the start if set (F3 toggles the overlay), and
+# where to write its figures on exit (times frames even with the overlay hidden)
+PROFILE = os.environ.get("MATH_QUIZ_PROFILE", "") not in ("", "0")
+PROFILE_CSV = os.environ.get("MATH_QUIZ_PROFILE_CSV", "")
+
+# Record the session's input here for replay.py
+RECORD_FILE = os.environ.get("MATH_QUIZ_RECORD", "")
 
 class Player:
     def __init__(self, x, y):
@@ -51,9 +102,10 @@ class Player:
         self.vel_y = 0
         self.on_ground = False
         self.color = BLUE
+        self.ticks = 0
         
-    def update(self, platforms):
-        keys = pygame.key.get_pressed()
+    def update(self, platforms, keys):
+        self.ticks += 1
         
         # Horizontal movement
         self.vel_x = 0
@@ -83,18 +135,16 @@ class Player:
         self.on_ground = False
         player_rect = pygame.Rect(self.x, self.y, self.width, self.height)
         
-        for platform in platforms:
-            platform_rect = pygame.Rect(platform[0], platform[1], platform[2], platform[3])
-            if player_rect.colliderect(platform_rect):
-                # Landing on top of platform
-                if self.vel_y > 0 and self.y < platform[1]:
-                    self.y = platform[1] - self.height
-                    self.vel_y = 0
-                    self.on_ground = True
-                # Hitting platform from below
-                elif self.vel_y < 0 and self.y > platform[1]:
-                    self.y = platform[1] + platform[3]
-                    self.vel_y = 0
+        for platform in platforms.hits(player_rect):
+            # Landing on top of platform
+            if self.vel_y > 0 and self.y < platform.y:
+                self.y = platform.y - self.height
+                self.vel_y = 0
+                self.on_ground = True
+            # Hitting platform from below
+            elif self.vel_y < 0 and self.y > platform.y:
+                self.y = platform.y + platform.height
+                self.vel_y = 0
                     
         # Ground collision
         if self.y + self.height >= SCREEN_HEIGHT - 50:
@@ -102,16 +152,12 @@ class Player:
             self.vel_y = 0
             self.on_ground = True
             
-    def draw(self, screen):
-        # Draw player as a cute character
-        pygame.draw.rect(screen, self.color, (self.x, self.y, self.width, self.height))
-        # Eyes
-        pygame.draw.circle(screen, WHITE, (int(self.x + 10), int(self.y + 15)), 5)
-        pygame.draw.circle(screen, WHITE, (int(self.x + 30), int(self.y + 15)), 5)
-        pygame.draw.circle(screen, BLACK, (int(self.x + 12), int(self.y + 15)), 2)
-        pygame.draw.circle(screen, BLACK, (int(self.x + 32), int(self.y + 15)), 2)
-        # Smile
-        pygame.draw.arc(screen, BLACK, (self.x + 10, self.y + 25, 20, 15), 0, math.pi, 2)
+    def frame(self):
+        """Animation frame: 0 eyes open, 1 blinking."""
+        return 1 if self.ticks % BLINK_EVERY >= BLINK_EVERY - BLINK_STEPS else 0
+    
+    def draw(self, screen, sprites):
+        sprites.blit(screen, "player", (int(self.x), int(self.y)), self.frame())
 
 class Door:
     def __init__(self, x, y, question_number):
@@ -121,152 +167,98 @@ class Door:
         self.height = 80
         self.question_number = question_number
         self.opened = False
+        self.rect = pygame.Rect(x, y, self.width, self.height)
         
-    def draw(self, screen):
-        color = GREEN if self.opened else YELLOW
-        pygame.draw.rect(screen, color, (self.x, self.y, self.width, self.height))
-        pygame.draw.rect(screen, BLACK, (self.x, self.y, self.width, self.height), 3)
-        
-        # Door handle
-        pygame.draw.circle(screen, BLACK, (int(self.x + 45), int(self.y + 40)), 5)
-        
-        # Question number if not opened
-        if not self.opened:
-            font = pygame.font.Font(None, 24)
-            text = font.render(f"Q{self.question_number}", True, BLACK)
-            text_rect = text.get_rect(center=(self.x + self.width//2, self.y + self.height//2))
-            screen.blit(text, text_rect)
+    def draw(self, screen, sprites):
+        name = "door_open" if self.opened else ("door", self.question_number)
+        sprites.blit(screen, name, (self.x, self.y))
+
+def render_player_frames(color=BLUE):
+    # Draw player as a cute character, eyes open and blinking
+    frames = []
+    for blinking in (False, True):
+        surface = pygame.Surface((40, 50), pygame.SRCALPHA)
+        pygame.draw.rect(surface, color, (0, 0, 40, 50))
+        # Eyes
+        if blinking:
+            pygame.draw.line(surface, BLACK, (6, 15), (14, 15), 2)
+            pygame.draw.line(surface, BLACK, (26, 15), (34, 15), 2)
+        else:
+            pygame.draw.circle(surface, WHITE, (10, 15), 5)
+            pygame.draw.circle(surface, WHITE, (30, 15), 5)
+            pygame.draw.circle(surface, BLACK, (12, 15), 2)
+            pygame.draw.circle(surface, BLACK, (32, 15), 2)
+        # Smile
+        pygame.draw.arc(surface, BLACK, (10, 25, 20, 15), 0, math.pi, 2)
+        frames.append(surface)
+    return frames
+
+def render_door_frame(question_number=None):
+    """An opened door, or a closed one labelled with its question number."""
+    surface = pygame.Surface((60, 80), pygame.SRCALPHA)
+    color = YELLOW if question_number is not None else GREEN
+    pygame.draw.rect(surface, color, (0, 0, 60, 80))
+    pygame.draw.rect(surface, BLACK, (0, 0, 60, 80), 3)
+
+    # Door handle
+    pygame.draw.circle(surface, BLACK, (45, 40), 5)
+
+    # Question number if not opened
+    if question_number is not None:
+        text = render_text(f"Q{question_number}", FONT_SMALL, BLACK)
+        surface.blit(text, text.get_rect(center=(30, 40)))
+    return surface
+
+def build_sprites():
+    """Player and door sprites for every door number the levels use."""
+    sprites = SpriteAtlas()
+    sprites.add("player", render_player_frames())
+    sprites.add("door_open", [render_door_frame()])
+    for number in range(1, max(len(spec.doors) for spec in LEVELS) + 1):
+        sprites.add(("door", number), [render_door_frame(number)])
+    sprites.build()
+    return sprites
 
 class MathQuestion:
-    def __init__(self, level, question_number):
+    def __init__(self, level, question_number, rng=random):
         self.level = level
         self.question_number = question_number
+        self.rng = rng
         self.generate_question()
         
     def generate_question(self):
-        # Difficulty increases with level
-        if self.level == 1:
-            # Level 1: Simple addition/subtraction (1-10)
-            self.num1 = random.randint(1, 10)
-            self.num2 = random.randint(1, 10)
-            if random.choice([True, False]):
-                self.operation = "+"
-                self.correct_answer = self.num1 + self.num2
-                self.question = f"{self.num1} + {self.num2} = ?"
-            else:
-                if self.num1 < self.num2:
-                    self.num1, self.num2 = self.num2, self.num1
-                self.operation = "-"
-                self.correct_answer = self.num1 - self.num2
-                self.question = f"{self.num1} - {self.num2} = ?"
-                
-        elif self.level == 2:
-            # Level 2: Medium addition/subtraction (10-25)
-            self.num1 = random.randint(10, 25)
-            self.num2 = random.randint(5, 15)
-            if random.choice([True, False]):
-                self.operation = "+"
-                self.correct_answer = self.num1 + self.num2
-                self.question = f"{self.num1} + {self.num2} = ?"
-            else:
-                self.operation = "-"
-                self.correct_answer = self.num1 - self.num2
-                self.question = f"{self.num1} - {self.num2} = ?"
-                
-        elif self.level == 3:
-            # Level 3: Larger numbers + simple multiplication
-            if random.choice([True, False, False]):  # 1/3 chance multiplication
-                self.num1 = random.randint(2, 8)
-                self.num2 = random.randint(2, 8)
-                self.operation = "×"
-                self.correct_answer = self.num1 * self.num2
-                self.question = f"{self.num1} × {self.num2} = ?"
-            else:
-                self.num1 = random.randint(20, 50)
-                self.num2 = random.randint(10, 25)
-                if random.choice([True, False]):
-                    self.operation = "+"
-                    self.correct_answer = self.num1 + self.num2
-                    self.question = f"{self.num1} + {self.num2} = ?"
-                else:
-                    self.operation = "-"
-                    self.correct_answer = self.num1 - self.num2
-                    self.question = f"{self.num1} - {self.num2} = ?"
-                    
-        elif self.level == 4:
-            # Level 4: More multiplication + larger numbers
-            if random.choice([True, False]):  # 50% chance multiplication
-                self.num1 = random.randint(3, 12)
-                self.num2 = random.randint(3, 12)
-                self.operation = "×"
-                self.correct_answer = self.num1 * self.num2
-                self.question = f"{self.num1} × {self.num2} = ?"
-            else:
-                self.num1 = random.randint(50, 100)
-                self.num2 = random.randint(20, 40)
-                if random.choice([True, False]):
-                    self.operation = "+"
-                    self.correct_answer = self.num1 + self.num2
-                    self.question = f"{self.num1} + {self.num2} = ?"
-                else:
-                    self.operation = "-"
-                    self.correct_answer = self.num1 - self.num2
-                    self.question = f"{self.num1} - {self.num2} = ?"
-                    
-        else:  # Level 5+
-            # Level 5+: Advanced problems
-            operation_choice = random.choice(["add", "sub", "mult", "mult"])  # More multiplication
-            if operation_choice == "mult":
-                self.num1 = random.randint(5, 15)
-                self.num2 = random.randint(5, 15)
-                self.operation = "×"
-                self.correct_answer = self.num1 * self.num2
-                self.question = f"{self.num1} × {self.num2} = ?"
-            elif operation_choice == "add":
-                self.num1 = random.randint(75, 150)
-                self.num2 = random.randint(25, 75)
-                self.operation = "+"
-                self.correct_answer = self.num1 + self.num2
-                self.question = f"{self.num1} + {self.num2} = ?"
-            else:  # subtraction
-                self.num1 = random.randint(100, 200)
-                self.num2 = random.randint(25, 75)
-                self.operation = "-"
-                self.correct_answer = self.num1 - self.num2
-                self.question = f"{self.num1} - {self.num2} = ?"
+        # Difficulty increases with level (see levels.py)
+        spec = level_spec(self.level)
+        operation = spec.pick_operation(self.rng)
+        self.num1, self.num2 = operation.operands(self.rng)
+        self.operation = operation.symbol
+        self.correct_answer = operation.apply(self.num1, self.num2)
+        self.question = f"{self.num1} {self.operation} {self.num2} = ?"
         
         # Generate wrong answers
-        self.answers = [self.correct_answer]
-        while len(self.answers) < 4:
-            if self.operation == "×":
-                wrong = self.correct_answer + random.randint(-15, 15)
-            else:
-                wrong = self.correct_answer + random.randint(-10, 10)
-            if wrong not in self.answers and wrong >= 0:
-                self.answers.append(wrong)
+        self.answers = [self.correct_answer] + make_distractors(
+            self.num1, self.num2, self.operation, self.correct_answer, operation.spread, spec.distractors,
+            rng=self.rng)
         
-        random.shuffle(self.answers)
+        self.rng.shuffle(self.answers)
         self.correct_index = self.answers.index(self.correct_answer)
 
 class Leaderboard:
-    def __init__(self):
-        self.scores = self.load_scores()
-    
-    def load_scores(self):
-        try:
-            if os.path.exists(LEADERBOARD_FILE):
-                with open(LEADERBOARD_FILE, 'r') as f:
-                    return json.load(f)
-            return []
-        except:
-            return []
-    
-    def save_scores(self):
-        try:
-            with open(LEADERBOARD_FILE, 'w') as f:
-                json.dump(self.scores, f, indent=2)
-        except:
-            pass
+    def __init__(self, store=None):
+        # Saves run on a background thread so submitting a score never waits on disk
+        self.writer = BackgroundWriter()
+        if store is None:
+            # Optional backends are imported only when chosen (http.client is slow to import)
+            if LEADERBOARD_BACKEND == "sqlite":
+                from leaderboard_sqlite import SQLiteStore
+                store = SQLiteStore(LEADERBOARD_DB_FILE, legacy_path=LEADERBOARD_FILE, writer=self.writer)
+            else:
+                store = JsonLinesStore(LEADERBOARD_LOG_FILE, legacy_path=LEADERBOARD_FILE, writer=self.writer)
+                if LEADERBOARD_BACKEND == "http":
+                    from leaderboard_http import HttpStore
+                    # The local log keeps results while the service is unreachable
+                    store = HttpStore(LEADERBOARD_URL, fallback=store)
+        self.store = store
     
     def add_score(self, name, score, level):
         entry = {
@@ -275,33 +267,65 @@ class Leaderboard:
             'level': level,
             'date': datetime.now().strftime('%Y-%m-%d %H:%M')
         }
-        self.scores.append(entry)
-        # Sort by score (descending) then by level (descending)
-        self.scores.sort(key=lambda x: (x['score'], x['level']), reverse=True)
-        # Keep only top 10
-        self.scores = self.scores[:10]
-        self.save_scores()
+        # Ranked by score (descending) then by level (descending)
+        self.store.add(entry)
     
     def get_top_scores(self, limit=10):
-        return self.scores[:limit]
+        return self.store.top(limit)
+    
+    def close(self):
+        # Let pending saves finish before exiting
+        self.store.close()
+        self.writer.close()
 
 class Game:
-    def __init__(self):
+    def __init__(self, seed=None):
+        # Display, fonts and audio (if there is a device) - importing the module starts nothing
+        self.audio = start_engine()
+        
+        # Every random choice in the game comes from this generator, so a seed
+        # and the player's input reproduce a session (see recording.py)
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.rng = random.Random(self.seed)
+        
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Math Quiz Adventure - Enhanced Edition")
         self.clock = pygame.time.Clock()
-        self.font_large = pygame.font.Font(None, 48)
-        self.font_medium = pygame.font.Font(None, 36)
-        self.font_small = pygame.font.Font(None, 24)
+        # Sleeps on screens waiting for input, slows down in the background
+        self.scheduler = FrameScheduler(self.clock, FPS, BACKGROUND_FPS)
+        # Gradient backgrounds are rendered once and reused every frame
+        self.backgrounds = BackgroundCache()
+        self.background_theme = DEFAULT_THEME
+        # Sky, ground and platforms baked once per level, doors on top
+        self.level_layers = LevelLayers(self.draw_scenery, self.draw_doors)
+        
+        # Per-phase frame timings (F3)
+        self.profiler = FrameProfiler(enabled=PROFILE or bool(PROFILE_CSV), visible=PROFILE)
         
-        # Create simple sound effects
-        self.create_sounds()
+        # Player and door frames, rendered once into one surface
+        self.sprites = build_sprites()
+        
+        # Only the parts of the game screen that changed are repainted
+        self.renderer = DirtyRenderer(self.screen, self.profiler)
+        
+        # Feedback tones, synthesized once and cached on disk
+        self.sounds = SoundBank() if self.audio else NullSoundBank()
+        
+        # Play events, written in batches off the game loop
+        if TELEMETRY_FILE:
+            self.telemetry = Telemetry(TELEMETRY_FILE, writer=BackgroundWriter(name="telemetry-writer"))
+        else:
+            self.telemetry = NullTelemetry()
         
         # Game state flags
+        self.running = False
         self.game_started = False
         self.show_name_input_start = True
         self.show_level_transition = False
         self.transition_timer = 0
+        # Simulation time not yet stepped; starts with one step queued so the
+        # first frame updates the game
+        self.accumulator = SIM_STEP_SECONDS
         
         # Initialize game state
         self.reset_game()
@@ -334,151 +358,51 @@ class Game:
         self.show_question = False
         self.question_result = None
         self.current_door = None
+        self.question_attempt = 0
+        self.question_shown_at = None
         
     def setup_level_layout(self):
         """Create different maze layouts for each level"""
-        if self.current_level == 1:
-            # Level 1: Simple layout - easy jumps
-            self.platforms = [
-                [200, 500, 150, 20],
-                [400, 400, 150, 20],
-                [600, 300, 150, 20],
-                [300, 200, 150, 20],
-                [700, 150, 150, 20]
-            ]
-            self.doors = [
-                Door(320, 420, 1),
-                Door(520, 220, 2),
-                Door(720, 370, 3),
-                Door(420, 120, 4),
-                Door(820, 70, 5)
-            ]
-        elif self.current_level == 2:
-            # Level 2: Medium complexity - more platforms
-            self.platforms = [
-                [150, 450, 120, 20],
-                [350, 350, 120, 20],
-                [550, 450, 120, 20],
-                [750, 300, 120, 20],
-                [200, 250, 120, 20],
-                [500, 200, 120, 20],
-                [800, 150, 120, 20]
-            ]
-            self.doors = [
-                Door(270, 370, 1),
-                Door(470, 370, 2),
-                Door(670, 370, 3),
-                Door(320, 170, 4),
-                Door(920, 70, 5)
-            ]
-        elif self.current_level == 3:
-            # Level 3: Vertical challenge - tower climbing
-            self.platforms = [
-                [100, 500, 100, 20],
-                [300, 450, 100, 20],
-                [500, 400, 100, 20],
-                [700, 350, 100, 20],
-                [200, 300, 100, 20],
-                [400, 250, 100, 20],
-                [600, 200, 100, 20],
-                [800, 150, 100, 20]
-            ]
-            self.doors = [
-                Door(220, 420, 1),
-                Door(420, 370, 2),
-                Door(620, 320, 3),
-                Door(320, 220, 4),
-                Door(720, 120, 5)
-            ]
-        elif self.current_level == 4:
-            # Level 4: Scattered platforms - precision jumps
-            self.platforms = [
-                [80, 480, 80, 20],
-                [250, 420, 80, 20],
-                [450, 380, 80, 20],
-                [650, 340, 80, 20],
-                [850, 300, 80, 20],
-                [150, 280, 80, 20],
-                [350, 220, 80, 20],
-                [550, 160, 80, 20],
-                [750, 100, 80, 20]
-            ]
-            self.doors = [
-                Door(170, 400, 1),
-                Door(370, 340, 2),
-                Door(570, 300, 3),
-                Door(270, 140, 4),
-                Door(870, 20, 5)
-            ]
-        else:  # Level 5
-            # Level 5: Complex maze - ultimate challenge
-            self.platforms = [
-                [50, 500, 100, 20],
-                [200, 480, 80, 20],
-                [350, 460, 80, 20],
-                [500, 440, 80, 20],
-                [650, 420, 80, 20],
-                [800, 400, 100, 20],
-                [100, 380, 80, 20],
-                [250, 360, 80, 20],
-                [400, 340, 80, 20],
-                [550, 320, 80, 20],
-                [700, 300, 80, 20],
-                [150, 260, 80, 20],
-                [300, 240, 80, 20],
-                [450, 220, 80, 20],
-                [600, 200, 80, 20],
-                [750, 180, 80, 20],
-                [200, 140, 80, 20],
-                [400, 120, 80, 20],
-                [600, 100, 80, 20],
-                [800, 80, 100, 20]
-            ]
-            self.doors = [
-                Door(170, 400, 1),
-                Door(320, 280, 2),
-                Door(470, 140, 3),
-                Door(520, 40, 4),
-                Door(920, 0, 5)
-            ]
-        
-    def create_sounds(self):
-        # Create simple beep sounds
-        try:
-            # Correct answer sound (higher pitch)
-            self.correct_sound = pygame.mixer.Sound(buffer=b'\x00\x00' * 1000)
-            # Incorrect answer sound (lower pitch)
-            self.incorrect_sound = pygame.mixer.Sound(buffer=b'\x00\x00' * 1000)
-        except:
-            self.correct_sound = None
-            self.incorrect_sound = None
-    
-    def play_correct_sound(self):
-        if self.correct_sound:
-            try:
-                self.correct_sound.play()
-            except:
-                pass
-    
-    def play_incorrect_sound(self):
-        if self.incorrect_sound:
-            try:
-                self.incorrect_sound.play()
-            except:
-                pass
-    
+        spec = level_spec(self.current_level)
+        theme = spec.theme or DEFAULT_THEME
+        if theme != self.background_theme:
+            self.backgrounds.invalidate(theme=self.background_theme)
+            self.background_theme = theme
+        
+        self.doors = [Door(x, y, number) for number, (x, y) in enumerate(spec.doors, 1)]
+        
+        # Prebuilt rects, tested in batch (with a grid for big levels); doors
+        # drop out of the collision list as they open
+        self.platforms = [pygame.Rect(platform) for platform in spec.platforms]
+        self.platform_colliders = PlatformColliders(self.platforms)
+        self.door_colliders = DoorColliders(self.doors)
+        self.level_layers.invalidate()
+        
+        # Every door's question, ready before the player reaches it
+        level = self.current_level
+        self.question_pool = QuestionPool(lambda number: MathQuestion(level, number, self.rng),
+                                          [door.question_number for door in self.doors])
+        
     def check_door_collision(self):
         player_rect = pygame.Rect(self.player.x, self.player.y, self.player.width, self.player.height)
-        for door in self.doors:
-            if not door.opened:
-                door_rect = pygame.Rect(door.x, door.y, door.width, door.height)
-                if player_rect.colliderect(door_rect):
-                    self.current_question = MathQuestion(self.current_level, door.question_number)
-                    self.show_question = True
-                    self.current_door = door
-                    return True
+        door = self.door_colliders.first_hit(player_rect)
+        if door is not None:
+            self.current_question = self.question_pool.pop(door.question_number)
+            self.show_question = True
+            self.current_door = door
+            self.question_attempt = 0
+            self.telemetry.emit('door', level=self.current_level, door=door.question_number)
+            self.question_shown()
+            return True
         return False
     
+    def question_shown(self):
+        self.question_attempt += 1
+        self.question_shown_at = time.monotonic()
+        self.telemetry.emit('question', level=self.current_level, door=self.current_door.question_number,
+                            question=self.current_question.question,
+                            answer=self.current_question.correct_answer, attempt=self.question_attempt)
+    
     def handle_question_input(self, event):
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_1:
@@ -490,7 +414,7 @@ class Game:
             elif event.key == pygame.K_4:
                 self.check_answer(3)
         elif event.type == pygame.MOUSEBUTTONDOWN:
-            mouse_x, mouse_y = pygame.mouse.get_pos()
+            mouse_x, mouse_y = event.pos
             # Check if clicked on answer buttons
             button_width = 200
             button_height = 60
@@ -504,10 +428,16 @@ class Game:
                     break
     
     def check_answer(self, selected_index):
-        if selected_index == self.current_question.correct_index:
+        correct = selected_index == self.current_question.correct_index
+        self.telemetry.emit('answer', level=self.current_level, door=self.current_door.question_number,
+                            choice=self.current_question.answers[selected_index], correct=correct,
+                            ms=round((time.monotonic() - self.question_shown_at) * 1000),
+                            attempt=self.question_attempt)
+        if correct:
             self.question_result = "correct"
-            self.play_correct_sound()
             self.current_door.opened = True
+            self.door_colliders.remove(self.current_door)
+            self.level_layers.invalidate_doors()
             self.questions_answered += 1
             self.questions_correct += 1
             self.consecutive_correct += 1
@@ -520,26 +450,32 @@ class Game:
             
             # Check if level is completed (all 5 doors opened)
             doors_opened = sum(1 for door in self.doors if door.opened)
-            if doors_opened >= QUESTIONS_PER_LEVEL:
+            if doors_opened >= len(self.doors):
                 self.level_completed = True
                 self.score += LEVEL_COMPLETION_BONUS
+                self.sounds.play('level_complete')
+            elif self.consecutive_correct >= 3:
+                self.sounds.play('streak')
+            else:
+                self.sounds.play('correct')
                 
         else:
             self.question_result = "incorrect"
-            self.play_incorrect_sound()
+            self.sounds.play('incorrect')
             self.consecutive_correct = 0
     
     def advance_level(self):
-        if self.current_level < 5:
+        if self.current_level < MAX_LEVEL:
             self.current_level += 1
             self.questions_answered = 0
             self.questions_correct = 0
             self.level_completed = False
             self.show_level_transition = True
-            self.transition_timer = 180  # 3 seconds at 60 FPS
+            self.transition_timer = LEVEL_TRANSITION_STEPS
             
             # Setup new level layout
             self.setup_level_layout()
+            self.telemetry.emit('level', level=self.current_level, score=self.score)
             
             # Reset player position
             self.player.x = 50
@@ -548,8 +484,13 @@ class Game:
             self.player.vel_y = 0
         else:
             # Game completed
-            self.game_won = True
-            self.show_name_input = True
+            self.win()
+    
+    def win(self):
+        self.game_won = True
+        self.show_name_input = True
+        self.telemetry.emit('won', level=self.current_level, score=self.score)
+        self.telemetry.flush()
     
     def handle_name_input_start(self, event):
         if event.type == pygame.KEYDOWN:
@@ -557,6 +498,8 @@ class Game:
                 if self.player_name.strip():
                     self.show_name_input_start = False
                     self.game_started = True
+                    self.telemetry.emit('session', name=self.player_name.strip(),
+                                        date=datetime.now().strftime('%Y-%m-%d %H:%M'))
             elif event.key == pygame.K_BACKSPACE:
                 self.player_name = self.player_name[:-1]
             else:
@@ -578,10 +521,7 @@ class Game:
     
     def draw_question(self):
         # Semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(220)
-        overlay.fill(BLACK)
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(get_overlay((SCREEN_WIDTH, SCREEN_HEIGHT), BLACK, 220), (0, 0))
         
         # Question box - adjusted size to prevent overlaps
         box_width = 650
@@ -599,19 +539,18 @@ class Game:
         pygame.draw.rect(self.screen, PURPLE, (box_x, box_y, box_width, header_height), 6)
         
         # Level and question info - adjusted positioning
-        level_text = self.font_large.render(f"Level {self.current_level}", True, PURPLE)
+        level_text = render_text(f"Level {self.current_level}", FONT_LARGE, PURPLE)
         level_rect = level_text.get_rect(center=(SCREEN_WIDTH // 2, box_y + 25))
         self.screen.blit(level_text, level_rect)
         
         # Show doors opened instead of questions answered
         doors_opened = sum(1 for door in self.doors if door.opened)
-        question_info = self.font_medium.render(f"Door {doors_opened + 1} of {QUESTIONS_PER_LEVEL}", True, BLACK)
+        question_info = render_text(f"Door {doors_opened + 1} of {len(self.doors)}", FONT_MEDIUM, BLACK)
         info_rect = question_info.get_rect(center=(SCREEN_WIDTH // 2, box_y + 50))
         self.screen.blit(question_info, info_rect)
         
         # Question text - slightly smaller but still prominent
-        question_font = pygame.font.Font(None, 52)  # Reduced from 64
-        question_text = question_font.render(self.current_question.question, True, BLACK)
+        question_text = render_text(self.current_question.question, 52, BLACK)  # Reduced from 64
         question_rect = question_text.get_rect(center=(SCREEN_WIDTH // 2, box_y + 110))
         self.screen.blit(question_text, question_rect)
         
@@ -644,8 +583,7 @@ class Game:
             pygame.draw.rect(self.screen, BLACK, (start_x, button_y, button_width, button_height), 3)
             
             # Answer text - more reasonable font size
-            answer_font = pygame.font.Font(None, 32)  # Reduced from 42
-            answer_text = answer_font.render(f"{i+1}. {answer}", True, text_color)
+            answer_text = render_text(f"{i+1}. {answer}", 32, text_color)  # Reduced from 42
             answer_rect = answer_text.get_rect(center=(start_x + button_width // 2, button_y + button_height // 2))
             self.screen.blit(answer_text, answer_rect)
         
@@ -654,7 +592,7 @@ class Game:
         result_y = box_y + box_height - 40
         
         if not self.question_result:
-            instruction_text = self.font_medium.render("Click on an answer or press 1-4", True, PURPLE)
+            instruction_text = render_text("Click on an answer or press 1-4", FONT_MEDIUM, PURPLE)
             instruction_rect = instruction_text.get_rect(center=(SCREEN_WIDTH // 2, instruction_y))
             self.screen.blit(instruction_text, instruction_rect)
         else:
@@ -662,91 +600,89 @@ class Game:
                 points = POINTS_PER_CORRECT
                 if self.consecutive_correct >= 3:
                     points *= BONUS_POINTS_MULTIPLIER
-                    result_text = self.font_medium.render(f"Correct! +{points} points (BONUS!)", True, GREEN)  # Reduced font size
+                    result_text = render_text(f"Correct! +{points} points (BONUS!)", FONT_MEDIUM, GREEN)  # Reduced font size
                 else:
-                    result_text = self.font_medium.render(f"Correct! +{points} points", True, GREEN)
+                    result_text = render_text(f"Correct! +{points} points", FONT_MEDIUM, GREEN)
             else:
-                result_text = self.font_medium.render("Try again!", True, RED)
+                result_text = render_text("Try again!", FONT_MEDIUM, RED)
             result_rect = result_text.get_rect(center=(SCREEN_WIDTH // 2, instruction_y))
             self.screen.blit(result_text, result_rect)
             
-            continue_text = self.font_small.render("Press SPACE to continue", True, PURPLE)  # Made smaller
+            continue_text = render_text("Press SPACE to continue", FONT_SMALL, PURPLE)  # Made smaller
             continue_rect = continue_text.get_rect(center=(SCREEN_WIDTH // 2, result_y))
             self.screen.blit(continue_text, continue_rect)
     
-    def draw_background(self):
-        # Gradient background
-        for y in range(SCREEN_HEIGHT):
-            color_ratio = y / SCREEN_HEIGHT
-            r = int(135 + (255 - 135) * color_ratio)
-            g = int(206 + (255 - 206) * color_ratio)
-            b = int(235 + (255 - 235) * color_ratio)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (SCREEN_WIDTH, y))
+    def draw_background(self, surface):
+        # Cached gradient background - a single blit
+        self.backgrounds.draw(surface, self.background_theme)
     
-    def draw_platforms(self):
+    def draw_platforms(self, surface):
         for platform in self.platforms:
-            pygame.draw.rect(self.screen, GREEN, platform)
-            pygame.draw.rect(self.screen, BLACK, platform, 2)
+            # Filled border then inset fill: same pixels as a 2px outline, but
+            # stays exact when the dirty renderer draws through a clip rect
+            pygame.draw.rect(surface, BLACK, platform)
+            pygame.draw.rect(surface, GREEN, platform.inflate(-4, -4))
+    
+    def draw_ground(self, surface):
+        pygame.draw.rect(surface, GREEN, (0, SCREEN_HEIGHT - 50, SCREEN_WIDTH, 50))
+        pygame.draw.rect(surface, BLACK, (0, SCREEN_HEIGHT - 50, SCREEN_WIDTH, 50), 3)
+    
+    def draw_scenery(self, surface):
+        profile = self.profiler.phase
+        with profile("background"):
+            self.draw_background(surface)
+        with profile("platforms"):
+            self.draw_ground(surface)
+            self.draw_platforms(surface)
     
-    def draw_ground(self):
-        pygame.draw.rect(self.screen, GREEN, (0, SCREEN_HEIGHT - 50, SCREEN_WIDTH, 50))
-        pygame.draw.rect(self.screen, BLACK, (0, SCREEN_HEIGHT - 50, SCREEN_WIDTH, 50), 3)
+    def draw_doors(self, surface):
+        with self.profiler.phase("doors"):
+            for door in self.doors:
+                door.draw(surface, self.sprites)
     
     def draw_ui(self):
         # Create a semi-transparent background for UI elements
-        ui_bg = pygame.Surface((300, 120))
-        ui_bg.set_alpha(180)
-        ui_bg.fill(WHITE)
-        self.screen.blit(ui_bg, (10, 10))
+        self.screen.blit(get_overlay((300, 120), WHITE, 180), (10, 10))
         
         # Border for UI panel
         pygame.draw.rect(self.screen, BLACK, (10, 10, 300, 120), 3)
         
         # Score and level info with better formatting
-        score_text = self.font_large.render(f"Score: {self.score}", True, PURPLE)
+        score_text = render_text(f"Score: {self.score}", FONT_LARGE, PURPLE)
         self.screen.blit(score_text, (20, 20))
         
-        level_text = self.font_medium.render(f"Level: {self.current_level}", True, BLACK)
+        level_text = render_text(f"Level: {self.current_level}", FONT_MEDIUM, BLACK)
         self.screen.blit(level_text, (20, 50))
         
         # Count doors opened instead of questions answered
         doors_opened = sum(1 for door in self.doors if door.opened)
-        progress_text = self.font_medium.render(f"Doors: {doors_opened}/{QUESTIONS_PER_LEVEL}", True, BLACK)
+        progress_text = render_text(f"Doors: {doors_opened}/{len(self.doors)}", FONT_MEDIUM, BLACK)
         self.screen.blit(progress_text, (20, 75))
         
         # Bonus streak indicator - more prominent
         if self.consecutive_correct >= 3:
-            bonus_bg = pygame.Surface((200, 30))
-            bonus_bg.set_alpha(200)
-            bonus_bg.fill(GOLD)
-            self.screen.blit(bonus_bg, (20, 95))
+            self.screen.blit(get_overlay((200, 30), GOLD, 200), (20, 95))
             
-            bonus_text = self.font_medium.render(f"🔥 STREAK: {self.consecutive_correct}!", True, RED)
+            bonus_text = render_text(f"🔥 STREAK: {self.consecutive_correct}!", FONT_MEDIUM, RED)
             self.screen.blit(bonus_text, (25, 100))
         
         # Instructions - better positioned and more readable
         if not self.show_question:
-            instruction_bg = pygame.Surface((SCREEN_WIDTH - 20, 40))
-            instruction_bg.set_alpha(150)
-            instruction_bg.fill(WHITE)
-            self.screen.blit(instruction_bg, (10, SCREEN_HEIGHT - 50))
+            self.screen.blit(get_overlay((SCREEN_WIDTH - 20, 40), WHITE, 150), (10, SCREEN_HEIGHT - 50))
             
-            instruction_text = self.font_medium.render("Use arrow keys to move and jump. Touch doors to answer math questions!", True, BLACK)
+            instruction_text = render_text("Use arrow keys to move and jump. Touch doors to answer math questions!", FONT_MEDIUM, BLACK)
             self.screen.blit(instruction_text, (20, SCREEN_HEIGHT - 40))
             
             # Controls hint
-            controls_text = self.font_small.render("Press L for Leaderboard", True, PURPLE)
+            controls_text = render_text("Press L for Leaderboard", FONT_SMALL, PURPLE)
             self.screen.blit(controls_text, (20, SCREEN_HEIGHT - 20))
     
     def draw_start_screen(self):
         # Gradient background
-        self.draw_background()
+        self.draw_background(self.screen)
         
         # Welcome overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(200)
-        overlay.fill(PURPLE)
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(get_overlay((SCREEN_WIDTH, SCREEN_HEIGHT), PURPLE, 200), (0, 0))
         
         # Welcome box
         box_width = 600
@@ -758,18 +694,17 @@ class Game:
         pygame.draw.rect(self.screen, GOLD, (box_x, box_y, box_width, box_height), 8)
         
         # Title
-        title_font = pygame.font.Font(None, 64)
-        title_text = title_font.render("🎮 Math Quiz Adventure 🎮", True, PURPLE)
+        title_text = render_text("🎮 Math Quiz Adventure 🎮", 64, PURPLE)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, box_y + 60))
         self.screen.blit(title_text, title_rect)
         
         # Subtitle
-        subtitle_text = self.font_medium.render("Enhanced Edition with 5 Levels!", True, GOLD)
+        subtitle_text = render_text(f"Enhanced Edition with {MAX_LEVEL} Levels!", FONT_MEDIUM, GOLD)
         subtitle_rect = subtitle_text.get_rect(center=(SCREEN_WIDTH // 2, box_y + 100))
         self.screen.blit(subtitle_text, subtitle_rect)
         
         # Name input prompt
-        prompt_text = self.font_large.render("Enter your name:", True, BLACK)
+        prompt_text = render_text("Enter your name:", FONT_LARGE, BLACK)
         prompt_rect = prompt_text.get_rect(center=(SCREEN_WIDTH // 2, box_y + 160))
         self.screen.blit(prompt_text, prompt_rect)
         
@@ -778,38 +713,33 @@ class Game:
         pygame.draw.rect(self.screen, LIGHT_BLUE, input_rect)
         pygame.draw.rect(self.screen, BLACK, input_rect, 3)
         
-        name_text = self.font_large.render(self.player_name, True, BLACK)
+        name_text = render_text(self.player_name, FONT_LARGE, BLACK)
         self.screen.blit(name_text, (input_rect.x + 10, input_rect.y + 8))
         
         # Instructions
-        instruction1 = self.font_medium.render("• Use arrow keys to move and jump", True, BLACK)
+        instruction1 = render_text("• Use arrow keys to move and jump", FONT_MEDIUM, BLACK)
         self.screen.blit(instruction1, (box_x + 50, box_y + 270))
         
-        instruction2 = self.font_medium.render("• Touch doors to answer math questions", True, BLACK)
+        instruction2 = render_text("• Touch doors to answer math questions", FONT_MEDIUM, BLACK)
         self.screen.blit(instruction2, (box_x + 50, box_y + 300))
         
-        instruction3 = self.font_medium.render("• Complete 5 questions per level", True, BLACK)
+        door_counts = sorted({len(spec.doors) for spec in LEVELS})
+        questions = (str(door_counts[0]) if len(door_counts) == 1
+                     else f"{door_counts[0]}-{door_counts[-1]}")
+        instruction3 = render_text(f"• Complete {questions} questions per level", FONT_MEDIUM, BLACK)
         self.screen.blit(instruction3, (box_x + 50, box_y + 330))
         
         # Start instruction
-        start_text = self.font_medium.render("Press ENTER to start your adventure!", True, GREEN)
+        start_text = render_text("Press ENTER to start your adventure!", FONT_MEDIUM, GREEN)
         start_rect = start_text.get_rect(center=(SCREEN_WIDTH // 2, box_y + 370))
         self.screen.blit(start_text, start_rect)
     
     def draw_level_transition(self):
         # Background with current level layout
-        self.draw_background()
-        self.draw_ground()
-        self.draw_platforms()
-        
-        for door in self.doors:
-            door.draw(self.screen)
+        self.level_layers.draw(self.screen)
         
         # Transition overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(200)
-        overlay.fill(BLACK)
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(get_overlay((SCREEN_WIDTH, SCREEN_HEIGHT), BLACK, 200), (0, 0))
         
         # Transition box
         box_width = 500
@@ -821,46 +751,34 @@ class Game:
         pygame.draw.rect(self.screen, PURPLE, (box_x, box_y, box_width, box_height), 6)
         
         # Level announcement
-        level_font = pygame.font.Font(None, 72)
-        level_text = level_font.render(f"🚀 LEVEL {self.current_level} 🚀", True, PURPLE)
+        level_text = render_text(f"🚀 LEVEL {self.current_level} 🚀", 72, PURPLE)
         level_rect = level_text.get_rect(center=(SCREEN_WIDTH // 2, box_y + 60))
         self.screen.blit(level_text, level_rect)
         
         # Level description
-        level_descriptions = {
-            1: "Simple Addition & Subtraction",
-            2: "Medium Problems",
-            3: "Larger Numbers + Multiplication",
-            4: "Advanced Multiplication",
-            5: "Ultimate Math Challenge!"
-        }
-        
-        desc_text = self.font_large.render(level_descriptions[self.current_level], True, BLACK)
+        desc_text = render_text(level_spec(self.current_level).description, FONT_LARGE, BLACK)
         desc_rect = desc_text.get_rect(center=(SCREEN_WIDTH // 2, box_y + 120))
         self.screen.blit(desc_text, desc_rect)
         
         # Player info
-        player_text = self.font_medium.render(f"Player: {self.player_name}", True, GOLD)
+        player_text = render_text(f"Player: {self.player_name}", FONT_MEDIUM, GOLD)
         player_rect = player_text.get_rect(center=(SCREEN_WIDTH // 2, box_y + 160))
         self.screen.blit(player_text, player_rect)
         
-        score_text = self.font_medium.render(f"Current Score: {self.score}", True, GREEN)
+        score_text = render_text(f"Current Score: {self.score}", FONT_MEDIUM, GREEN)
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, box_y + 190))
         self.screen.blit(score_text, score_rect)
         
         # Countdown or ready message
-        if self.transition_timer > 60:
-            ready_text = self.font_medium.render("Get Ready!", True, RED)
+        if self.transition_timer > SIM_STEPS_PER_SECOND:
+            ready_text = render_text("Get Ready!", FONT_MEDIUM, RED)
         else:
-            ready_text = self.font_medium.render("GO!", True, GREEN)
+            ready_text = render_text("GO!", FONT_MEDIUM, GREEN)
         ready_rect = ready_text.get_rect(center=(SCREEN_WIDTH // 2, box_y + 220))
         self.screen.blit(ready_text, ready_rect)
     
     def draw_level_complete(self):
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(230)
-        overlay.fill(PURPLE)
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(get_overlay((SCREEN_WIDTH, SCREEN_HEIGHT), PURPLE, 230), (0, 0))
         
         # Celebration box
         box_width = 600
@@ -872,36 +790,29 @@ class Game:
         pygame.draw.rect(self.screen, GOLD, (box_x, box_y, box_width, box_height), 8)
         
         # Celebration header - show the level that was just completed
-        celebration_font = pygame.font.Font(None, 72)
-        complete_text = celebration_font.render(f"🎉 Level {self.current_level} Complete! 🎉", True, PURPLE)
+        complete_text = render_text(f"🎉 Level {self.current_level} Complete! 🎉", 72, PURPLE)
         complete_rect = complete_text.get_rect(center=(SCREEN_WIDTH // 2, box_y + 60))
         self.screen.blit(complete_text, complete_rect)
         
         # Score breakdown
-        score_font = pygame.font.Font(None, 48)
-        score_text = score_font.render(f"Level Bonus: +{LEVEL_COMPLETION_BONUS} points", True, GOLD)
+        score_text = render_text(f"Level Bonus: +{LEVEL_COMPLETION_BONUS} points", 48, GOLD)
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, box_y + 120))
         self.screen.blit(score_text, score_rect)
         
-        total_font = pygame.font.Font(None, 56)
-        total_text = total_font.render(f"Total Score: {self.score}", True, GREEN)
+        total_text = render_text(f"Total Score: {self.score}", 56, GREEN)
         total_rect = total_text.get_rect(center=(SCREEN_WIDTH // 2, box_y + 170))
         self.screen.blit(total_text, total_rect)
         
         # Continue instruction
-        continue_font = pygame.font.Font(None, 40)
-        if self.current_level < 5:
-            continue_text = continue_font.render(f"Press SPACE to continue to Level {self.current_level + 1}", True, BLACK)
+        if self.current_level < MAX_LEVEL:
+            continue_text = render_text(f"Press SPACE to continue to Level {self.current_level + 1}", 40, BLACK)
         else:
-            continue_text = continue_font.render("Press SPACE to finish the game!", True, BLACK)
+            continue_text = render_text("Press SPACE to finish the game!", 40, BLACK)
         continue_rect = continue_text.get_rect(center=(SCREEN_WIDTH // 2, box_y + 230))
         self.screen.blit(continue_text, continue_rect)
     
     def draw_name_input(self):
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(200)
-        overlay.fill(BLACK)
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(get_overlay((SCREEN_WIDTH, SCREEN_HEIGHT), BLACK, 200), (0, 0))
         
         # Input box
         box_width = 400
@@ -913,16 +824,16 @@ class Game:
         pygame.draw.rect(self.screen, BLACK, (box_x, box_y, box_width, box_height), 5)
         
         # Congratulations text
-        congrats_text = self.font_medium.render("Congratulations!", True, BLACK)
+        congrats_text = render_text("Congratulations!", FONT_MEDIUM, BLACK)
         congrats_rect = congrats_text.get_rect(center=(SCREEN_WIDTH // 2, box_y + 40))
         self.screen.blit(congrats_text, congrats_rect)
         
-        score_text = self.font_medium.render(f"Final Score: {self.score}", True, PURPLE)
+        score_text = render_text(f"Final Score: {self.score}", FONT_MEDIUM, PURPLE)
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, box_y + 70))
         self.screen.blit(score_text, score_rect)
         
         # Name input
-        name_prompt = self.font_small.render("Enter your name for the leaderboard:", True, BLACK)
+        name_prompt = render_text("Enter your name for the leaderboard:", FONT_SMALL, BLACK)
         name_rect = name_prompt.get_rect(center=(SCREEN_WIDTH // 2, box_y + 100))
         self.screen.blit(name_prompt, name_rect)
         
@@ -931,19 +842,16 @@ class Game:
         pygame.draw.rect(self.screen, LIGHT_BLUE, input_rect)
         pygame.draw.rect(self.screen, BLACK, input_rect, 2)
         
-        name_text = self.font_medium.render(self.player_name, True, BLACK)
+        name_text = render_text(self.player_name, FONT_MEDIUM, BLACK)
         self.screen.blit(name_text, (input_rect.x + 5, input_rect.y + 5))
         
         # Instructions
-        enter_text = self.font_small.render("Press ENTER to submit", True, BLACK)
+        enter_text = render_text("Press ENTER to submit", FONT_SMALL, BLACK)
         enter_rect = enter_text.get_rect(center=(SCREEN_WIDTH // 2, box_y + 170))
         self.screen.blit(enter_text, enter_rect)
     
     def draw_leaderboard(self):
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(200)
-        overlay.fill(BLACK)
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(get_overlay((SCREEN_WIDTH, SCREEN_HEIGHT), BLACK, 200), (0, 0))
         
         # Leaderboard box
         box_width = 600
@@ -955,24 +863,24 @@ class Game:
         pygame.draw.rect(self.screen, BLACK, (box_x, box_y, box_width, box_height), 5)
         
         # Title
-        title_text = self.font_large.render("🏆 LEADERBOARD 🏆", True, GOLD)
+        title_text = render_text("🏆 LEADERBOARD 🏆", FONT_LARGE, GOLD)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, box_y + 40))
         self.screen.blit(title_text, title_rect)
         
         # Headers
-        rank_text = self.font_medium.render("Rank", True, BLACK)
+        rank_text = render_text("Rank", FONT_MEDIUM, BLACK)
         self.screen.blit(rank_text, (box_x + 50, box_y + 80))
         
-        name_text = self.font_medium.render("Name", True, BLACK)
+        name_text = render_text("Name", FONT_MEDIUM, BLACK)
         self.screen.blit(name_text, (box_x + 150, box_y + 80))
         
-        score_text = self.font_medium.render("Score", True, BLACK)
+        score_text = render_text("Score", FONT_MEDIUM, BLACK)
         self.screen.blit(score_text, (box_x + 300, box_y + 80))
         
-        level_text = self.font_medium.render("Level", True, BLACK)
+        level_text = render_text("Level", FONT_MEDIUM, BLACK)
         self.screen.blit(level_text, (box_x + 400, box_y + 80))
         
-        date_text = self.font_medium.render("Date", True, BLACK)
+        date_text = render_text("Date", FONT_MEDIUM, BLACK)
         self.screen.blit(date_text, (box_x + 480, box_y + 80))
         
         # Scores
@@ -981,114 +889,215 @@ class Game:
             y_pos = box_y + 120 + i * 35
             color = GOLD if i == 0 else BLACK
             
-            rank_text = self.font_small.render(f"{i+1}.", True, color)
+            rank_text = render_text(f"{i+1}.", FONT_SMALL, color)
             self.screen.blit(rank_text, (box_x + 50, y_pos))
             
-            name_text = self.font_small.render(entry['name'][:12], True, color)
+            name_text = render_text(entry['name'][:12], FONT_SMALL, color)
             self.screen.blit(name_text, (box_x + 150, y_pos))
             
-            score_text = self.font_small.render(str(entry['score']), True, color)
+            score_text = render_text(str(entry['score']), FONT_SMALL, color)
             self.screen.blit(score_text, (box_x + 300, y_pos))
             
-            level_text = self.font_small.render(str(entry['level']), True, color)
+            level_text = render_text(str(entry['level']), FONT_SMALL, color)
             self.screen.blit(level_text, (box_x + 400, y_pos))
             
-            date_text = self.font_small.render(entry['date'][-5:], True, color)  # Show time only
+            date_text = render_text(entry['date'][-5:], FONT_SMALL, color)  # Show time only
             self.screen.blit(date_text, (box_x + 480, y_pos))
         
         # Instructions
-        instruction_text = self.font_small.render("Press R to play again, L to toggle leaderboard, or ESC to quit", True, BLACK)
+        instruction_text = render_text("Press R to play again, L to toggle leaderboard, or ESC to quit", FONT_SMALL, BLACK)
         instruction_rect = instruction_text.get_rect(center=(SCREEN_WIDTH // 2, box_y + box_height - 30))
         self.screen.blit(instruction_text, instruction_rect)
     
-    def run(self):
-        running = True
-        
-        while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        running = False
-                    elif event.key == pygame.K_l and self.game_started:  # Toggle leaderboard
-                        self.show_leaderboard = not self.show_leaderboard
-                    elif event.key == pygame.K_r and (self.game_won or self.show_leaderboard):
-                        self.reset_game()
-                        self.show_leaderboard = False
-                        self.show_name_input = False
-                        self.player_name = ""
-                    elif event.key == pygame.K_SPACE:
-                        if self.show_question and self.question_result:
-                            if self.question_result == "correct":
-                                self.show_question = False
-                                self.question_result = None
-                                
-                                # Check if level is completed
-                                if self.level_completed:
-                                    if self.current_level < 5:
-                                        self.advance_level()
-                                    else:
-                                        self.game_won = True
-                                        self.show_name_input = True
+    def draw_game(self):
+        profile = self.profiler.phase
+        with profile("world"):
+            # Scenery and doors, pre-composited - rebuilt only when they change
+            self.level_layers.draw(self.screen)
+        
+        if self.game_started and not self.show_question:
+            with profile("player"):
+                self.player.draw(self.screen, self.sprites)
+        
+        if self.game_started:
+            with profile("ui"):
+                self.draw_ui()
+        
+        with profile("overlays"):
+            if self.show_question:
+                self.draw_question()
+            elif self.level_completed and not self.game_won:
+                self.draw_level_complete()
+    
+    def track_sprites(self):
+        # Player (padded for the float -> pixel rounding of its primitives)
+        player_rect = pygame.Rect(int(self.player.x), int(self.player.y), self.player.width, self.player.height)
+        self.renderer.track("player", player_rect.inflate(4, 4), self.player.frame())
+        
+        for i, door in enumerate(self.doors):
+            self.renderer.track(("door", i), door.rect, door.opened)
+        
+        # Score panel, including the streak banner
+        doors_opened = sum(1 for door in self.doors if door.opened)
+        ui_state = (self.score, self.current_level, doors_opened, self.consecutive_correct)
+        self.renderer.track("ui", (10, 10, 300, 120), ui_state)
+        
+        if self.profiler.visible:
+            self.renderer.track("profiler", self.profiler.overlay_rect(self.screen), self.profiler.version)
+    
+    def handle_event(self, event):
+        if self.scheduler.handle_event(event):
+            self.renderer.invalidate()
+        
+        if event.type == pygame.QUIT:
+            self.running = False
+        elif event.type == pygame.VIDEORESIZE:
+            # Cached backgrounds were built for the old window size
+            self.backgrounds.invalidate()
+            self.renderer.invalidate()
+        elif event.type == pygame.VIDEOEXPOSE:
+            self.renderer.invalidate()
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                self.running = False
+            elif event.key == pygame.K_F3:
+                self.profiler.toggle()
+                self.renderer.invalidate()
+            elif event.key == pygame.K_l and self.game_started:  # Toggle leaderboard
+                self.show_leaderboard = not self.show_leaderboard
+            elif event.key == pygame.K_r and (self.game_won or self.show_leaderboard):
+                self.reset_game()
+                self.show_leaderboard = False
+                self.show_name_input = False
+                self.player_name = ""
+            elif event.key == pygame.K_SPACE:
+                if self.show_question and self.question_result:
+                    if self.question_result == "correct":
+                        self.show_question = False
+                        self.question_result = None
+
+                        # Check if level is completed
+                        if self.level_completed:
+                            if self.current_level < MAX_LEVEL:
+                                self.advance_level()
                             else:
-                                self.question_result = None
-                        elif self.level_completed and not self.game_won and not self.show_level_transition:
-                            self.advance_level()
-                
-                # Handle different input screens
-                if self.show_name_input_start:
-                    self.handle_name_input_start(event)
-                elif self.show_name_input:
-                    self.handle_name_input(event)
-                elif self.show_question and not self.question_result and self.game_started:
-                    self.handle_question_input(event)
-            
-            # Update transition timer
-            if self.show_level_transition:
-                self.transition_timer -= 1
-                if self.transition_timer <= 0:
-                    self.show_level_transition = False
-            
-            # Game logic - only when game is active
-            if (self.game_started and not self.show_question and not self.game_won and 
-                not self.show_leaderboard and not self.level_completed and not self.show_level_transition):
-                self.player.update(self.platforms)
+                                self.win()
+                    else:
+                        self.question_result = None
+                        self.question_shown()
+                elif self.level_completed and not self.game_won and not self.show_level_transition:
+                    self.advance_level()
+
+        # Handle different input screens
+        if self.show_name_input_start:
+            self.handle_name_input_start(event)
+        elif self.show_name_input:
+            self.handle_name_input(event)
+        elif self.show_question and not self.question_result and self.game_started:
+            self.handle_question_input(event)
+    
+    def step(self, keys):
+        """Advance the game logic by one fixed simulation step."""
+        # Update transition timer
+        if self.show_level_transition:
+            self.transition_timer -= 1
+            if self.transition_timer <= 0:
+                self.show_level_transition = False
+
+        # Game logic - only when game is active
+        if (self.game_started and not self.show_question and not self.game_won and 
+            not self.show_leaderboard and not self.level_completed and not self.show_level_transition):
+            with self.profiler.phase("update"):
+                self.player.update(self.platform_colliders, keys)
+            with self.profiler.phase("doors_hit"):
                 if self.check_door_collision():
                     pass  # Question will be shown
-            
-            # Draw everything based on current state
-            if self.show_name_input_start:
-                self.draw_start_screen()
-            elif self.show_level_transition:
-                self.draw_level_transition()
-            elif self.show_leaderboard:
-                self.draw_leaderboard()
-            elif self.show_name_input:
-                self.draw_name_input()
-            else:
-                # Draw main game
-                self.draw_background()
-                self.draw_ground()
-                self.draw_platforms()
-                
-                for door in self.doors:
-                    door.draw(self.screen)
-                
-                if self.game_started and not self.show_question:
-                    self.player.draw(self.screen)
-                
-                if self.game_started:
-                    self.draw_ui()
-                
-                if self.show_question:
-                    self.draw_question()
-                elif self.level_completed and not self.game_won:
-                    self.draw_level_complete()
-            
-            pygame.display.flip()
-            self.clock.tick(FPS)
+    
+    def render(self):
+        # Draw everything based on current state
+        if self.show_name_input_start:
+            draw = self.draw_start_screen
+        elif self.show_level_transition:
+            draw = self.draw_level_transition
+        elif self.show_leaderboard:
+            draw = self.draw_leaderboard
+        elif self.show_name_input:
+            draw = self.draw_name_input
+        else:
+            draw = self.draw_game
+
+        if draw == self.draw_game and self.game_started and not self.show_question and not self.level_completed:
+            # Plain gameplay - only repaint what moved or changed
+            self.renderer.begin_tracking()
+            self.track_sprites()
+        else:
+            # Overlays and screen changes repaint the whole window
+            self.renderer.invalidate()
         
+        def draw_frame():
+            if draw == self.draw_game:
+                draw()
+            else:
+                with self.profiler.phase("overlays"):
+                    draw()
+            self.profiler.draw(self.screen)
+        self.renderer.present(draw_frame)
+    
+    def advance(self, events, keys, elapsed_ms):
+        """Handle one frame's input and run the steps due after elapsed_ms."""
+        with self.profiler.phase("events"):
+            for event in events:
+                self.handle_event(event)
+        
+        # Run as many fixed steps as real time has passed, independent of
+        # how long rendering takes (capped so a stall can't snowball)
+        self.accumulator += elapsed_ms / 1000
+        steps = 0
+        while self.accumulator >= SIM_STEP_SECONDS and steps < MAX_STEPS_PER_FRAME:
+            self.step(keys)
+            self.accumulator -= SIM_STEP_SECONDS
+            steps += 1
+        if steps == MAX_STEPS_PER_FRAME:
+            self.accumulator = 0
+    
+    def is_idle(self):
+        """True on screens that only change on input - nothing moves or counts down."""
+        if self.show_level_transition:
+            return False
+        return (self.show_name_input_start or self.show_question or self.show_leaderboard or
+                self.show_name_input or self.level_completed or self.game_won)
+    
+    def run(self):
+        self.running = True
+        elapsed_ms = 0
+        recorder = Recorder(RECORD_FILE, self.seed) if RECORD_FILE else None
+        idle = False
+        
+        while self.running:
+            # Once a static screen is drawn, sleep until there's input (or a timeout)
+            events = self.scheduler.wait(idle)
+            self.profiler.begin_frame()
+            with self.profiler.phase("events"):
+                events += pygame.event.get()
+            keys = pygame.key.get_pressed()
+            if recorder is not None:
+                recorder.record(elapsed_ms, events, keys)
+            self.advance(events, keys, elapsed_ms)
+            if self.scheduler.should_render():
+                self.render()
+            self.profiler.end_frame()
+            elapsed_ms = self.scheduler.tick()
+            if idle:
+                # Time spent waiting for input isn't game time
+                elapsed_ms = min(elapsed_ms, 1000 // FPS)
+            idle = self.is_idle()
+        
+        if recorder is not None:
+            recorder.close()
+        if PROFILE_CSV:
+            self.profiler.dump_csv(PROFILE_CSV)
+        self.leaderboard.close()
+        self.telemetry.close()
         pygame.quit()
 
 if __name__ == "__main__":
@@ -0,0 +1,148 @@
+"""Crash-safe file writes, off the game loop.
+
+atomic_write replaces a file via a temp file in the same directory, fsync and
+os.replace, so readers (and the next startup) see either the old or the new
+contents - never a truncated file.
+
+BackgroundWriter runs these (or any other disk work) on a daemon thread fed
+by a bounded queue, so the frame that submits a score doesn't wait on the
+disk. If the queue is full, submit blocks until there is room rather than
+dropping a write.
+
+file_lock takes an fcntl advisory lock so several game instances can share
+one file; file_signature tells whether a file changed since it was last read.
+"""
+
+import logging
+import os
+import queue
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # Windows - no advisory locks, single instance assumed
+    fcntl = None
+
+# Writes waiting for the writer thread before submit() blocks
+DEFAULT_MAX_PENDING = 64
+
+log = logging.getLogger(__name__)
+
+
+def atomic_write(path, data):
+    """Replace path with data (str, written as UTF-8, or bytes)."""
+    binary = isinstance(data, bytes)
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb' if binary else 'w', encoding=None if binary else 'utf-8') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    fsync_directory(directory)
+
+
+def fsync_directory(directory):
+    """Make a rename in directory durable (not supported on Windows)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def file_lock(f, exclusive=True, blocking=True):
+    """Advisory lock on open file f for the with block.
+
+    Yields False without locking if blocking is False and another process
+    (or another open of the file) holds a conflicting lock.
+    """
+    if fcntl is None:
+        yield True
+        return
+    flags = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+    if not blocking:
+        flags |= fcntl.LOCK_NB
+    try:
+        fcntl.flock(f.fileno(), flags)
+    except BlockingIOError:
+        yield False
+        return
+    try:
+        yield True
+    finally:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def file_signature(path):
+    """(inode, size, mtime) of path, or None if it doesn't exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+class BackgroundWriter:
+    def __init__(self, max_pending=DEFAULT_MAX_PENDING, name="leaderboard-writer"):
+        self.queue = queue.Queue(max_pending)
+        self.thread = threading.Thread(target=self.work, name=name, daemon=True)
+        self.thread.start()
+
+    def submit(self, func, *args):
+        """Run func(*args) on the writer thread, in submission order."""
+        self.queue.put((func, args))
+
+    def work(self):
+        while True:
+            job = self.queue.get()
+            try:
+                if job is None:
+                    return
+                func, args = job
+                try:
+                    func(*args)
+                except Exception:
+                    # A failed save mustn't kill the writer; later writes may still succeed
+                    log.exception("Background write failed")
+            finally:
+                self.queue.task_done()
+
+    def flush(self):
+        """Wait until every submitted write has finished."""
+        self.queue.join()
+
+    def close(self):
+        """Finish pending writes and stop the thread."""
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+
+
+class ImmediateWriter:
+    """BackgroundWriter stand-in that writes on the calling thread."""
+
+    def submit(self, func, *args):
+        func(*args)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
@@ -0,0 +1,164 @@
+"""Frame profiler.
+
+Times the phases of each frame (event pump, player update, door collision,
+each draw step, display flip) and keeps the last `window` frames of every
+phase, from which it reports p50/p95/p99 in milliseconds. Press F3 in the
+game to show them in an overlay, or start with MATH_QUIZ_PROFILE=1; set
+MATH_QUIZ_PROFILE_CSV=frames.csv to write the figures on exit.
+
+Code marks a phase with
+
+    with profiler.phase("update"):
+        ...
+
+Phases that run several times in a frame (fixed steps, clipped redraws) are
+summed per frame; a phase's percentiles cover the frames it ran in. While the
+profiler is off, phase() hands back a shared no-op context manager.
+"""
+
+import csv
+import math
+import time
+from collections import deque
+from contextlib import nullcontext
+
+import pygame
+
+from text_cache import get_font
+
+# Frames kept per phase
+DEFAULT_WINDOW = 600
+# Frames between recomputing the percentiles shown in the overlay
+STATS_EVERY = 30
+# Overlay order; phases not listed here follow in the order first seen
+PHASES = ["frame", "events", "update", "doors_hit", "world", "background", "platforms", "doors", "player",
+          "ui", "overlays", "flip"]
+PERCENTILES = (50, 95, 99)
+
+OVERLAY_FONT = 20
+OVERLAY_LINE = 18
+OVERLAY_COLUMNS = (0, 90, 150, 210, 270)
+OVERLAY_PADDING = 8
+
+NO_PHASE = nullcontext()
+
+
+def percentile(ordered, p):
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+class Phase:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        frame = self.profiler.frame
+        frame[self.name] = frame.get(self.name, 0) + elapsed
+
+
+class FrameProfiler:
+    def __init__(self, enabled=False, window=DEFAULT_WINDOW, visible=None):
+        self.enabled = enabled
+        self.visible = enabled if visible is None else visible
+        # Timing asked for from the start (keeps running with the overlay hidden)
+        self.always_on = enabled
+        self.window = window
+        # phase -> per-frame milliseconds of the last `window` frames it ran in
+        self.samples = {name: deque(maxlen=window) for name in PHASES}
+        # phase -> seconds spent in it so far this frame
+        self.frame = {}
+        self.frame_start = None
+        self.frames = 0
+        # phase -> (frames, mean, p50, p95, p99, max)
+        self.stats = {}
+        # Bumped whenever the overlay's contents change
+        self.version = 0
+        self.surface = None
+
+    def phase(self, name):
+        if not self.enabled:
+            return NO_PHASE
+        return Phase(self, name)
+
+    def toggle(self):
+        """Show or hide the overlay (F3); timing runs while it shows."""
+        self.visible = not self.visible
+        enabled = self.visible or self.always_on
+        if enabled != self.enabled:
+            self.enabled = enabled
+            self.frame_start = None
+
+    def begin_frame(self):
+        if self.enabled:
+            self.frame.clear()
+            self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if not self.enabled or self.frame_start is None:
+            return
+        self.frame["frame"] = time.perf_counter() - self.frame_start
+        for name, seconds in self.frame.items():
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = deque(maxlen=self.window)
+            samples.append(seconds * 1000)
+        self.frames += 1
+        if self.frames % STATS_EVERY == 0:
+            self.update_stats()
+
+    def update_stats(self):
+        self.stats = {}
+        for name, samples in self.samples.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            self.stats[name] = ((len(ordered), sum(ordered) / len(ordered))
+                                + tuple(percentile(ordered, p) for p in PERCENTILES) + (ordered[-1],))
+        self.version += 1
+        self.surface = None
+
+    def overlay(self):
+        """The overlay surface, rendered again only when the figures change."""
+        if self.surface is None:
+            font = get_font(OVERLAY_FONT)
+            rows = [("phase ms",) + tuple(f"p{p}" for p in PERCENTILES) + ("max",)]
+            for name, (_, _, *figures) in self.stats.items():
+                rows.append((name,) + tuple(f"{value:.2f}" for value in figures))
+            if len(rows) == 1:
+                rows.append(("collecting...",))
+            width = OVERLAY_COLUMNS[-1] + 60 + 2 * OVERLAY_PADDING
+            height = len(rows) * OVERLAY_LINE + 2 * OVERLAY_PADDING
+            self.surface = pygame.Surface((width, height))
+            self.surface.fill((0, 0, 0))
+            for row_index, row in enumerate(rows):
+                y = OVERLAY_PADDING + row_index * OVERLAY_LINE
+                for x, cell in zip(OVERLAY_COLUMNS, row):
+                    text = font.render(cell, True, (255, 255, 100) if row_index == 0 else (255, 255, 255))
+                    self.surface.blit(text, (OVERLAY_PADDING + x, y))
+        return self.surface
+
+    def overlay_rect(self, screen):
+        return self.overlay().get_rect(topright=(screen.get_width() - 10, 10))
+
+    def draw(self, screen):
+        if self.visible:
+            screen.blit(self.overlay(), self.overlay_rect(screen))
+
+    def dump_csv(self, path):
+        """Write each phase's figures; does nothing if no frame was timed."""
+        self.update_stats()
+        if not self.stats:
+            return
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["phase", "frames", "mean_ms"] + [f"p{p}_ms" for p in PERCENTILES] + ["max_ms"])
+            for name, (frames, *figures) in self.stats.items():
+                writer.writerow([name, frames] + [f"{value:.3f}" for value in figures])
@@ -0,0 +1,115 @@
+"""Vectorized bulk question generation.
+
+MathQuestion builds one question at a time; generate_batch builds n questions
+for a level at once with NumPy, for worksheet export and headless testing.
+Questions follow the same per-level distributions as MathQuestion, from the
+level table in levels.py:
+
+- the same operation odds and operand ranges per level
+- operands ordered for operations marked non-negative
+- three distinct wrong answers, each within the operation's distractor
+  spread of the correct answer and never negative
+- the correct answer lands in a uniformly random slot
+
+Levels' plausible-mistake distractor strategies are not applied here.
+
+    questions = generate_batch(3, 1_000_000, seed=1)
+    questions['answers'][questions['correct_index'] == 0]
+"""
+
+import numpy as np
+
+from levels import level_spec
+
+# Operation codes stored in the 'operation' field index this list
+OPERATION_SYMBOLS = ["+", "-", "×"]
+ADD, SUB, MUL = range(3)
+
+QUESTION_DTYPE = np.dtype([
+    ('num1', np.int32),
+    ('num2', np.int32),
+    ('operation', np.uint8),
+    ('answers', np.int32, (4,)),
+    ('correct_index', np.uint8),
+])
+
+
+def level_rules(level):
+    """(weight, operation code, num1 range, num2 range, spread, non-negative) per operation."""
+    return [(op.weight, OPERATION_SYMBOLS.index(op.symbol), op.num1, op.num2, op.spread, op.non_negative)
+            for op in level_spec(level).operations]
+
+
+def generate_batch(level, n, seed=None):
+    """n questions for level as a structured array of QUESTION_DTYPE.
+
+    seed may be anything np.random.default_rng accepts, including a Generator.
+    """
+    rng = np.random.default_rng(seed)
+    rules = level_rules(level)
+    questions = np.zeros(n, dtype=QUESTION_DTYPE)
+
+    weights = np.array([rule[0] for rule in rules])
+    choice = rng.choice(len(rules), size=n, p=weights / weights.sum())
+    num1 = questions['num1']
+    num2 = questions['num2']
+    operation = questions['operation']
+    spread = np.zeros(n, dtype=np.int64)
+    for index, (_, op, range1, range2, op_spread, non_negative) in enumerate(rules):
+        rows = np.flatnonzero(choice == index)
+        a = rng.integers(range1[0], range1[1] + 1, size=rows.size)
+        b = rng.integers(range2[0], range2[1] + 1, size=rows.size)
+        if non_negative:
+            a, b = np.maximum(a, b), np.minimum(a, b)
+        num1[rows] = a
+        num2[rows] = b
+        operation[rows] = op
+        spread[rows] = op_spread
+
+    correct = np.select([operation == ADD, operation == SUB], [num1 + num2, num1 - num2], num1 * num2)
+    distractors = correct[:, None] + sample_offsets(rng, correct, spread)
+
+    # Correct answer in a random slot, distractors (already in random order) around it
+    correct_index = rng.integers(0, 4, size=n)
+    slots = np.arange(4)[None, :]
+    source = slots - (slots > correct_index[:, None])
+    answers = np.take_along_axis(distractors, np.minimum(source, 2), axis=1)
+    answers[slots == correct_index[:, None]] = correct
+    questions['answers'] = answers
+    questions['correct_index'] = correct_index
+    return questions
+
+
+def sample_offsets(rng, correct, spread):
+    """Three distinct non-zero offsets per row that keep the answer in
+    [max(correct - spread, 0), correct + spread], uniformly without
+    replacement.
+
+    Same values as distractors.sample_nearby: when the range holds fewer than
+    three wrong answers, it is extended upward.
+    """
+    n = correct.size
+    low = np.maximum(correct - spread, 0)
+    inside = correct >= low
+    high = np.maximum(correct + spread, low + 2 + inside)
+    count = high - low + 1 - inside
+
+    # Three distinct indices in [0, count) in random order
+    first = (rng.random(n) * count).astype(np.int64)
+    second = (rng.random(n) * (count - 1)).astype(np.int64)
+    second += second >= first
+    third = (rng.random(n) * (count - 2)).astype(np.int64)
+    smaller = np.minimum(first, second)
+    larger = np.maximum(first, second)
+    third += third >= smaller
+    third += third >= larger
+
+    values = low[:, None] + np.stack([first, second, third], axis=1)
+    # Step over the correct answer itself
+    values += inside[:, None] & (values >= correct[:, None])
+    return values - correct[:, None]
+
+
+def question_text(row):
+    """Display text for one row, as MathQuestion.question."""
+    return f"{row['num1']} {OPERATION_SYMBOLS[row['operation']]} {row['num2']} = ?"
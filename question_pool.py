@@ -0,0 +1,34 @@
+"""Per-level question pool.
+
+QuestionPool generates one question per door when a level is set up, with no
+two alike in the level, and hands each out when its door is touched.
+"""
+
+# Redraws allowed per door to find a question not already in the level; small
+# custom levels may not have enough distinct questions, so give up eventually
+MAX_DRAWS_PER_QUESTION = 50
+
+
+class QuestionPool:
+    def __init__(self, make_question, question_numbers, max_draws=MAX_DRAWS_PER_QUESTION):
+        """make_question(question_number) builds one question."""
+        self.make_question = make_question
+        self.questions = {}
+        seen = set()
+        for number in question_numbers:
+            for _ in range(max_draws):
+                question = make_question(number)
+                if question.question not in seen:
+                    break
+            seen.add(question.question)
+            self.questions[number] = question
+
+    def pop(self, question_number):
+        """The question for a door, generated now if the pool has none for it."""
+        question = self.questions.pop(question_number, None)
+        if question is None:
+            question = self.make_question(question_number)
+        return question
+
+    def __len__(self):
+        return len(self.questions)
@@ -0,0 +1,123 @@
+"""Input recordings.
+
+A recording holds everything that decides how a game plays out: the seed of
+the game's random number generator and, for every frame, the milliseconds
+since the previous frame, which movement keys were held and the input events
+the game reacts to (key presses, mouse clicks, quitting). Feeding these back
+into Game.advance reproduces the session exactly - see replay.py.
+
+Set MATH_QUIZ_RECORD=session.mqr to record a game. The file is a gzip stream:
+
+    header   b"MQR" version:u8 seed:u64
+    frame    elapsed_ms:u16 keys:u8 event_count:u8 event*
+    event    type:u8, then for
+               key press    key:i32 unicode_length:u8 unicode:utf-8
+               mouse click  button:u8 x:i16 y:i16
+               quit         nothing
+
+A frame where nothing happens takes 4 bytes before compression.
+"""
+
+import gzip
+import struct
+
+import pygame
+
+MAGIC = b"MQR"
+VERSION = 1
+HEADER = struct.Struct("<3sBQ")
+FRAME = struct.Struct("<HBB")
+KEY_PRESS = struct.Struct("<iB")
+MOUSE_CLICK = struct.Struct("<Bhh")
+
+# Keys read every step (Player.update); bit i of a frame's keys is KEYS[i]
+KEYS = [pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP]
+
+EVENT_KEY, EVENT_CLICK, EVENT_QUIT = range(3)
+
+
+class KeyState:
+    """Replayed or scripted stand-in for pygame.key.get_pressed()."""
+
+    def __init__(self, pressed=()):
+        self.pressed = frozenset(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+
+class Recorder:
+    def __init__(self, path, seed):
+        self.file = gzip.open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed))
+
+    def record(self, elapsed_ms, events, keys):
+        mask = 0
+        for bit, key in enumerate(KEYS):
+            if keys[key]:
+                mask |= 1 << bit
+        encoded = [encode_event(event) for event in events]
+        encoded = [data for data in encoded if data is not None]
+        self.file.write(FRAME.pack(min(elapsed_ms, 0xFFFF), mask, len(encoded)) + b"".join(encoded))
+
+    def close(self):
+        self.file.close()
+
+
+def encode_event(event):
+    """Bytes for an event the game reacts to, or None for the rest."""
+    if event.type == pygame.KEYDOWN:
+        text = event.unicode.encode('utf-8')[:255]
+        return bytes([EVENT_KEY]) + KEY_PRESS.pack(event.key, len(text)) + text
+    if event.type == pygame.MOUSEBUTTONDOWN:
+        return bytes([EVENT_CLICK]) + MOUSE_CLICK.pack(event.button, *event.pos)
+    if event.type == pygame.QUIT:
+        return bytes([EVENT_QUIT])
+    return None
+
+
+def read_exactly(f, size):
+    data = f.read(size)
+    if len(data) != size:
+        raise EOFError
+    return data
+
+
+def read_recording(path):
+    """Returns (seed, frames) where frames yields (elapsed_ms, events, keys).
+
+    A recording cut short (e.g. the game crashed) ends at its last complete frame.
+    """
+    f = gzip.open(path, 'rb')
+    magic, version, seed = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        f.close()
+        raise ValueError(f"{path} is not a version {VERSION} recording")
+
+    def frames():
+        with f:
+            while True:
+                try:
+                    yield read_frame(f)
+                except (EOFError, gzip.BadGzipFile):
+                    return
+
+    return seed, frames()
+
+
+def read_frame(f):
+    elapsed_ms, mask, count = FRAME.unpack(read_exactly(f, FRAME.size))
+    events = []
+    for _ in range(count):
+        kind = read_exactly(f, 1)[0]
+        if kind == EVENT_KEY:
+            key, length = KEY_PRESS.unpack(read_exactly(f, KEY_PRESS.size))
+            text = read_exactly(f, length).decode('utf-8')
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=key, unicode=text, mod=0, scancode=0))
+        elif kind == EVENT_CLICK:
+            button, x, y = MOUSE_CLICK.unpack(read_exactly(f, MOUSE_CLICK.size))
+            events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=button, pos=(x, y)))
+        else:
+            events.append(pygame.event.Event(pygame.QUIT))
+    keys = KeyState(key for bit, key in enumerate(KEYS) if mask & 1 << bit)
+    return elapsed_ms, events, keys
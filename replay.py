@@ -0,0 +1,114 @@
+"""Replay a recorded session.
+
+Plays back a recording made with MATH_QUIZ_RECORD=session.mqr (see
+recording.py) with SDL's dummy drivers, as fast as the CPU allows. The
+game's random seed and every frame's input are restored, so the replay ends
+in exactly the state the recorded game did - use it to reproduce bug reports
+or to time changes on an identical workload:
+
+    python replay.py session.mqr
+    python replay.py session.mqr --render --profile-csv frames.csv
+    python replay.py session.mqr --check-frames
+
+--check-frames renders every frame and, for the first frames of gameplay
+after each full-screen overlay (start screen, question, level transition,
+leaderboard), compares what the dirty-rect renderer left on screen with a
+full repaint.
+
+Runs in a temporary directory, so a replayed game never adds to the real
+leaderboard.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+# Sets the SDL dummy drivers and turns telemetry off before pygame initializes
+import headless
+
+import pygame
+
+from recording import read_recording
+
+mqa = headless.mqa
+
+
+# Tracked frames compared with a full repaint after each overlay closes
+CHECKED_FRAMES = 3
+
+
+def stale_frame(game):
+    """True if the screen differs from a full repaint of the same frame."""
+    presented = pygame.image.tobytes(game.screen, "RGB")
+    game.renderer.invalidate()
+    game.render()
+    return pygame.image.tobytes(game.screen, "RGB") != presented
+
+
+def replay(game, frames, render=False, check_frames=False):
+    """Feed recorded frames to game until they run out or it quits; returns
+    (frames played, game seconds, indexes of frames that failed the check)."""
+    game.running = True
+    count = 0
+    game_ms = 0
+    stale = []
+    since_overlay = None
+    for elapsed_ms, events, keys in frames:
+        game.profiler.begin_frame()
+        game.advance(events, keys, elapsed_ms)
+        if render or check_frames:
+            game.render()
+        game.profiler.end_frame()
+        if check_frames:
+            if not game.renderer.tracked_last:
+                since_overlay = 0
+            elif since_overlay is not None and since_overlay < CHECKED_FRAMES:
+                since_overlay += 1
+                if stale_frame(game):
+                    stale.append(count)
+        count += 1
+        game_ms += elapsed_ms
+        if not game.running:
+            break
+    return count, game_ms / 1000, stale
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded session headlessly")
+    parser.add_argument("recording")
+    parser.add_argument("--render", action="store_true", help="draw every frame too")
+    parser.add_argument("--check-frames", action="store_true",
+                        help="check the dirty-rect frames after each overlay against full repaints")
+    parser.add_argument("--profile-csv", help="write per-phase frame timings here (see profiler.py)")
+    args = parser.parse_args()
+
+    seed, frames = read_recording(args.recording)
+    profile_csv = os.path.abspath(args.profile_csv) if args.profile_csv else None
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        game = mqa.Game(seed=seed)
+        game.profiler.enabled = profile_csv is not None
+        start = time.perf_counter()
+        count, game_seconds, stale = replay(game, frames, args.render, args.check_frames)
+        elapsed = time.perf_counter() - start
+        game.leaderboard.close()
+        os.chdir(cwd)
+
+    print(f"replayed {count} frames ({game_seconds:.1f}s of play) in {elapsed:.2f}s "
+          f"({count / elapsed:,.0f} frames/s)")
+    print(f"level: {game.current_level}  score: {game.score}  "
+          f"doors opened: {sum(1 for door in game.doors if door.opened)}/{len(game.doors)}  won: {game.game_won}  "
+          f"player: ({game.player.x:.1f}, {game.player.y:.1f})")
+    if args.check_frames:
+        print(f"frames differing from a full repaint: {len(stale)}" + (f" (first: {stale[:10]})" if stale else ""))
+    if profile_csv:
+        game.profiler.dump_csv(profile_csv)
+    pygame.quit()
+    if stale:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
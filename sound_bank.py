@@ -0,0 +1,113 @@
+"""Synthesized sound effects.
+
+SoundBank synthesizes short tones and jingles with NumPy in the mixer's sample
+format, caches the PCM on disk keyed by the sound's parameters, and plays them
+on a pool of reserved mixer channels.
+
+NullSoundBank stands in when there is no audio device.
+"""
+
+import hashlib
+import json
+import os
+from collections import deque
+
+import numpy as np
+import pygame
+
+from persistence import atomic_write
+
+SOUND_CACHE_DIR = ".sound_cache"
+# Bump when synthesize() changes, so stale cached PCM isn't reused
+SYNTH_VERSION = 1
+RESERVED_CHANNELS = 4
+# Seconds to fade each note in and out (avoids clicks)
+ATTACK = 0.005
+RELEASE = 0.03
+
+# name -> (volume, [(frequency in Hz, or 0 for a rest, seconds), ...])
+SOUNDS = {
+    'correct': (0.35, [(523.25, 0.07), (659.25, 0.07), (783.99, 0.14)]),
+    'incorrect': (0.35, [(233.08, 0.12), (174.61, 0.26)]),
+    'streak': (0.35, [(523.25, 0.06), (659.25, 0.06), (783.99, 0.06), (1046.50, 0.18)]),
+    'level_complete': (0.4, [(523.25, 0.12), (659.25, 0.12), (783.99, 0.12), (0, 0.05),
+                             (783.99, 0.1), (1046.50, 0.35)]),
+}
+
+# Mixer sample formats (pygame.mixer.get_init()[1]) -> (NumPy type, scale, offset)
+SAMPLE_FORMATS = {
+    -16: (np.int16, 32767, 0),
+    16: (np.uint16, 32767, 32768),
+    -8: (np.int8, 127, 0),
+    8: (np.uint8, 127, 128),
+    32: (np.float32, 1.0, 0),
+}
+
+
+def synthesize(notes, volume, frequency, sample_format, channels):
+    """PCM bytes for notes in the given mixer format."""
+    parts = []
+    for pitch, seconds in notes:
+        count = int(seconds * frequency)
+        t = np.arange(count) / frequency
+        wave = np.sin(2 * np.pi * pitch * t) if pitch else np.zeros(count)
+        envelope = np.minimum(1.0, np.minimum(t / ATTACK, (seconds - t) / RELEASE))
+        parts.append(wave * np.clip(envelope, 0.0, 1.0))
+    samples = np.concatenate(parts) * volume
+
+    dtype, scale, offset = SAMPLE_FORMATS[sample_format]
+    pcm = (samples * scale + offset).astype(dtype)
+    # Same sample on every channel, interleaved
+    return np.repeat(pcm, channels).tobytes()
+
+
+def cache_key(notes, volume, mixer_format):
+    params = json.dumps([SYNTH_VERSION, volume, notes, mixer_format])
+    return hashlib.sha1(params.encode('utf-8')).hexdigest()
+
+
+class SoundBank:
+    def __init__(self, sounds=SOUNDS, cache_dir=SOUND_CACHE_DIR, reserved=RESERVED_CHANNELS):
+        frequency, sample_format, channels = pygame.mixer.get_init()
+        self.cache_dir = cache_dir
+        self.sounds = {}
+        for name, (volume, notes) in sounds.items():
+            pcm = self.load_pcm(notes, volume, (frequency, sample_format, channels))
+            self.sounds[name] = pygame.mixer.Sound(buffer=pcm)
+
+        # Channels kept out of pygame's automatic allocation, least recently
+        # started first
+        if pygame.mixer.get_num_channels() < reserved:
+            pygame.mixer.set_num_channels(reserved)
+        pygame.mixer.set_reserved(reserved)
+        self.channels = deque(pygame.mixer.Channel(i) for i in range(reserved))
+
+    def load_pcm(self, notes, volume, mixer_format):
+        path = os.path.join(self.cache_dir, cache_key(notes, volume, mixer_format) + ".pcm")
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            pass
+        pcm = synthesize(notes, volume, *mixer_format)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            atomic_write(path, pcm)
+        except OSError:
+            # Read-only install - synthesize again next time
+            pass
+        return pcm
+
+    def play(self, name):
+        # An idle channel if there is one, else the effect that started longest ago
+        channel = next((channel for channel in self.channels if not channel.get_busy()), self.channels[0])
+        self.channels.remove(channel)
+        self.channels.append(channel)
+        channel.play(self.sounds[name])
+
+
+class NullSoundBank:
+    """SoundBank stand-in for machines without audio."""
+
+    def play(self, name):
+        pass
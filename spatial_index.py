@@ -0,0 +1,60 @@
+"""Uniform-grid spatial index for level geometry.
+
+UniformGrid buckets static rects into fixed-size cells; a query only looks at
+objects in the cells the query rect overlaps.
+"""
+
+import pygame
+
+# Cell edge in pixels - a few player widths, so a query touches at most 4 cells
+DEFAULT_CELL_SIZE = 128
+
+
+class UniformGrid:
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.items = []
+
+    @classmethod
+    def from_rects(cls, rects, items=None, cell_size=DEFAULT_CELL_SIZE):
+        grid = cls(cell_size)
+        if items is None:
+            items = rects
+        for rect, item in zip(rects, items):
+            grid.insert(rect, item)
+        return grid
+
+    def cell_range(self, rect):
+        size = self.cell_size
+        return (int(rect.left // size), int((rect.right - 1) // size),
+                int(rect.top // size), int((rect.bottom - 1) // size))
+
+    def insert(self, rect, item):
+        rect = pygame.Rect(rect)
+        index = len(self.items)
+        self.items.append(item)
+        left, right, top, bottom = self.cell_range(rect)
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                self.cells.setdefault((cx, cy), []).append(index)
+
+    def query(self, rect):
+        """Items whose cells overlap rect, in insertion order.
+
+        This is a broad phase: callers still test the returned items for an
+        actual collision.
+        """
+        left, right, top, bottom = self.cell_range(pygame.Rect(rect))
+        cells = self.cells
+        if left == right and top == bottom:
+            return [self.items[i] for i in cells.get((left, top), ())]
+
+        found = set()
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                found.update(cells.get((cx, cy), ()))
+        return [self.items[i] for i in sorted(found)]
+
+    def __len__(self):
+        return len(self.items)
@@ -0,0 +1,69 @@
+"""Pre-rendered sprites packed into one surface.
+
+A SpriteAtlas holds each sprite's frames side by side in a single surface;
+drawing one is a blit of an area of it:
+
+    atlas = SpriteAtlas()
+    atlas.add("player", [open_eyes, blinking])
+    atlas.build()
+    atlas.blit(screen, "player", (x, y), frame)
+
+Sprites with several frames animate by passing a frame index; indexes wrap
+around. Atlas surfaces are shared - callers must only blit them.
+"""
+
+import pygame
+
+from engine import to_display_format
+
+# Widest the atlas grows before starting a new row of sprites
+MAX_WIDTH = 1024
+
+
+class SpriteAtlas:
+    def __init__(self, max_width=MAX_WIDTH):
+        self.max_width = max_width
+        self.pending = []
+        # name -> area of each frame in the atlas surface
+        self.frames = {}
+        self.surface = None
+
+    def add(self, name, frames):
+        """Queue a sprite's frames (surfaces) for build()."""
+        self.pending.append((name, list(frames)))
+
+    def build(self):
+        """Pack every queued frame into the atlas surface."""
+        # Shelf packing: left to right, starting a new row when one is full
+        x = y = row_height = 0
+        placed = []
+        for name, frames in self.pending:
+            areas = []
+            for frame in frames:
+                width, height = frame.get_size()
+                if x + width > self.max_width and x > 0:
+                    x, y, row_height = 0, y + row_height, 0
+                area = pygame.Rect(x, y, width, height)
+                areas.append(area)
+                placed.append((frame, area))
+                x += width
+                row_height = max(row_height, height)
+            self.frames[name] = areas
+        self.pending = []
+
+        size = (max((area.right for _, area in placed), default=1),
+                max((area.bottom for _, area in placed), default=1))
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        for frame, area in placed:
+            surface.blit(frame, area)
+        self.surface = to_display_format(surface, alpha=True)
+
+    def frame_count(self, name):
+        return len(self.frames[name])
+
+    def area(self, name, frame=0):
+        areas = self.frames[name]
+        return areas[frame % len(areas)]
+
+    def blit(self, screen, name, position, frame=0):
+        screen.blit(self.surface, position, self.area(name, frame))
@@ -0,0 +1,39 @@
+"""Pooled semi-transparent overlay surfaces.
+
+SurfacePool creates each (size, color, alpha) surface once and hands the same
+one back on every request.
+
+Pooled surfaces are shared - callers must only blit them, never draw on them.
+"""
+
+import pygame
+
+from engine import to_display_format
+
+
+class SurfacePool:
+    def __init__(self):
+        self.surfaces = {}
+        self.allocations = 0
+
+    def overlay(self, size, color, alpha):
+        key = (tuple(size), tuple(color), alpha)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = to_display_format(pygame.Surface(size))
+            surface.fill(color)
+            surface.set_alpha(alpha)
+            self.surfaces[key] = surface
+            self.allocations += 1
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+# Shared pool used by every draw path
+pool = SurfacePool()
+
+
+def get_overlay(size, color, alpha):
+    return pool.overlay(size, color, alpha)
@@ -0,0 +1,93 @@
+"""Session telemetry.
+
+Records what happens during play as a stream of events, so a teacher can see
+which questions a child missed and how long each answer took. emit() only
+appends a dict to an in-memory buffer; the buffer is handed to a writer (see
+persistence.py) in batches - every batch_size events, on the first emit()
+once flush_interval seconds have passed since the last batch, and on
+flush() or close() - which serializes it as compact JSON lines:
+
+    {"e":"answer","t":48213,"level":2,"door":3,"choice":42,"correct":true,"ms":3120,"attempt":1}
+
+Every event has its type `e` and `t`, milliseconds since the telemetry was
+opened. The game emits:
+
+    session   name, date        player entered their name
+    door      level, door       player touched a closed door
+    question  level, door, question, answer, attempt
+                                question shown (again after a wrong answer)
+    answer    level, door, choice, correct, ms, attempt
+                                answer picked; ms since the question was shown
+    level     level, score      advanced to level
+    won       level, score      finished the last level
+"""
+
+import json
+import time
+
+from persistence import ImmediateWriter
+
+DEFAULT_TELEMETRY_FILE = "telemetry.jsonl"
+# Events buffered before they're handed to the writer
+BATCH_SIZE = 64
+# Seconds an event may wait in the buffer
+FLUSH_INTERVAL = 5.0
+
+
+class Telemetry:
+    def __init__(self, path=DEFAULT_TELEMETRY_FILE, writer=None, batch_size=BATCH_SIZE,
+                 flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.writer = writer if writer is not None else ImmediateWriter()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.start = time.monotonic()
+        self.flushed_at = self.start
+        self.buffer = []
+        # Opened by the writer on its first batch
+        self.log = None
+
+    def emit(self, event, **fields):
+        now = time.monotonic()
+        record = {'e': event, 't': round((now - self.start) * 1000)}
+        record.update(fields)
+        self.buffer.append(record)
+        if len(self.buffer) >= self.batch_size or now - self.flushed_at >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        self.flushed_at = time.monotonic()
+        if self.buffer:
+            batch, self.buffer = self.buffer, []
+            self.writer.submit(self.write_batch, batch)
+
+    def write_batch(self, batch):
+        if self.log is None:
+            self.log = open(self.path, 'a', encoding='utf-8')
+        self.log.write("".join(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n"
+                               for record in batch))
+        self.log.flush()
+
+    def close(self):
+        """Write what's buffered and stop the writer."""
+        self.flush()
+        self.writer.submit(self.close_log)
+        self.writer.close()
+
+    def close_log(self):
+        if self.log is not None:
+            self.log.close()
+            self.log = None
+
+
+class NullTelemetry:
+    """Telemetry stand-in that records nothing."""
+
+    def emit(self, event, **fields):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
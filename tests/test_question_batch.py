@@ -0,0 +1,18 @@
+import numpy as np
+
+from question_batch import sample_offsets
+
+
+def test_negative_answers_get_non_negative_distractors():
+    # e.g. 0 - 30 from a level table without non_negative
+    correct = np.array([-30, -12, 0, 1, 50])
+    spread = np.array([10, 10, 10, 1, 10])
+    for seed in range(200):
+        values = correct[:, None] + sample_offsets(np.random.default_rng(seed), correct, spread)
+        assert (values >= 0).all()
+        assert (values != correct[:, None]).all()
+        assert all(len(set(row)) == 3 for row in values.tolist())
+    # Too few values in range - extended upward, as distractors.sample_nearby does
+    assert sorted(values[0]) == [0, 1, 2]
+    assert sorted(values[1]) == [0, 1, 2]
+    assert sorted(values[3]) == [0, 2, 3]
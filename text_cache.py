@@ -0,0 +1,93 @@
+"""Shared fonts and rendered-text cache.
+
+FontRegistry keeps one Font per size; TextCache keeps rendered text surfaces
+in an LRU keyed by (font size, text, color, antialias), bounded by a memory
+budget.
+
+Cached surfaces are shared - callers must only blit them, never draw on them.
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+# Upper bound for pixel memory held by cached text surfaces
+DEFAULT_TEXT_CACHE_BUDGET = 8 * 1024 * 1024
+
+
+class FontRegistry:
+    def __init__(self, font_name=None):
+        self.font_name = font_name
+        self.fonts = {}
+
+    def get(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(self.font_name, size)
+            self.fonts[size] = font
+        return font
+
+
+class TextCache:
+    def __init__(self, fonts=None, budget_bytes=DEFAULT_TEXT_CACHE_BUDGET):
+        self.fonts = fonts if fonts is not None else FontRegistry()
+        self.budget_bytes = budget_bytes
+        self.surfaces = OrderedDict()
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, text, size, color, antialias=True):
+        key = (size, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.fonts.get(size).render(text, antialias, color)
+        cost = surface_bytes(surface)
+        if cost > self.budget_bytes:
+            # Too big to ever fit - hand it out uncached
+            return surface
+
+        self.surfaces[key] = surface
+        self.used_bytes += cost
+        while self.used_bytes > self.budget_bytes:
+            _, evicted = self.surfaces.popitem(last=False)
+            self.used_bytes -= surface_bytes(evicted)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+        self.used_bytes = 0
+
+    def stats(self):
+        return {
+            'entries': len(self.surfaces),
+            'bytes': self.used_bytes,
+            'budget': self.budget_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+def surface_bytes(surface):
+    return surface.get_pitch() * surface.get_height()
+
+
+# Shared instances used by every draw path
+fonts = FontRegistry()
+text_cache = TextCache(fonts)
+
+
+def get_font(size):
+    return fonts.get(size)
+
+
+def render_text(text, size, color, antialias=True):
+    return text_cache.render(text, size, color, antialias)